@@ -1,6 +1,140 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # Launch time, for the time-to-first-paint measurements
+import argparse
+import atexit
+import contextlib
+import csv
+import functools
+import hashlib
+import itertools
+import json
+import math
+import mmap
+import os
+import queue
+import random
+import re
+import sqlite3
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import tracemalloc
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import tkinter as tk
-from tkinter import ttk, messagebox, Toplevel, Text, END, WORD, CENTER, X, Y, BOTH, LEFT, RIGHT, W, E, BOTTOM, DISABLED, Frame, Label, Button, Entry
-import mysql.connector  # MySQL Connector for connecting to XAMPP's MySQL
+from tkinter import ttk, messagebox, filedialog, simpledialog, Toplevel, Text, END, WORD, CENTER, X, Y, BOTH, LEFT, RIGHT, W, E, BOTTOM, DISABLED, Frame, Label, Button, Entry, Listbox
+mysql = None  # MySQL Connector for XAMPP's MySQL; imported by load_mysql() on first connect
+
+# Storage backend - "mysql" (XAMPP server) or "sqlite" (embedded file, no server needed)
+STORAGE_BACKEND = os.environ.get("QUOTEKEEPER_BACKEND", "mysql")
+SQLITE_PATH     = os.environ.get("QUOTEKEEPER_SQLITE_PATH",
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "quotes_keeper.db"))
+
+# Database settings - default XAMPP credentials; change if needed.
+DB_HOST     = "localhost"
+DB_USER     = "root"
+DB_PASSWORD = ""
+DB_NAME     = "quotes_keeper"
+
+# Errors raised by either storage backend (mysql.connector.Error is added once it is imported)
+DB_ERRORS = (sqlite3.Error,)
+
+# Connection pool settings
+POOL_SIZE               = 5     # Maximum number of open connections
+POOL_TIMEOUT            = 10    # Seconds to wait for a free connection before giving up
+POOL_IDLE_TIMEOUT       = 300   # Close connections that sat unused for this many seconds
+POOL_PING_INTERVAL      = 10    # Ping connections idle for longer than this on checkout (0 = always)
+POOL_RECONNECT_ATTEMPTS = 3     # Reconnect attempts when a health check fails
+POOL_RECONNECT_DELAY    = 1     # Seconds between reconnect attempts
+PREPARED_STATEMENTS     = True  # Keep hot statements prepared on each pooled connection
+PREPARED_CACHE_SIZE     = 32    # Prepared statements kept per connection (least recently used closed first)
+
+# Quote list settings
+VIRTUAL_LIST     = True   # Only materialize the rows visible in the main list
+ROW_HEIGHT       = 80     # Treeview row height in pixels
+PAGE_SIZE        = 200    # Rows fetched from the database per page
+VIRTUAL_BUFFER   = 2      # Extra rows rendered below the viewport
+MAX_CACHED_PAGES = 20     # Pages of rows kept in memory by the virtual list
+
+# Background worker settings
+WORKER_THREADS = 4    # Threads running database calls off the Tk event loop
+WORKER_POLL_MS = 30   # How often the Tk thread checks for finished database calls
+
+# Startup settings
+STARTUP_LOGIN_TARGET_MS      = 300   # Launch until the login window is painted
+STARTUP_FIRST_PAGE_TARGET_MS = 500   # Login accepted until the first page of quotes is shown
+
+# Live search settings
+LIVE_SEARCH_DELAY_MS    = 250    # Pause in typing before a search runs
+LIVE_SEARCH_REUSE_LIMIT = 5000   # Result sets up to this size are kept to refine in memory
+AUTOCOMPLETE_LIMIT      = 8      # Suggestions shown under the author/category fields
+
+# Bulk import settings
+IMPORT_BATCH_SIZE       = 1000            # Rows per executemany/LOAD DATA batch, each in its own transaction
+IMPORT_DEFAULT_CATEGORY = "Uncategorized"  # Used for imported quotes without a category
+
+# Bulk edit settings
+BULK_CHUNK_SIZE = 500   # Ids per DELETE/UPDATE ... WHERE id IN (...) statement
+
+# Duplicate detection settings
+DEDUP_CHECK_ON_ADD  = True   # Warn before saving a new or reworded quote that duplicates another
+DEDUP_THRESHOLD     = 0.7    # Estimated word-shingle similarity reported as a near-duplicate
+DEDUP_SHINGLE_WORDS = 2      # Words per shingle
+DEDUP_PERMUTATIONS  = 32     # MinHash signature length
+DEDUP_BANDS         = 8      # LSH bands (DEDUP_PERMUTATIONS / DEDUP_BANDS rows each)
+DEDUP_SEED          = 7      # Seed of the MinHash permutations
+DEDUP_SHINGLE_CACHE = 20000  # Shingles whose permutation values are kept in memory
+DEDUP_REPORT_GROUPS = 200    # Groups shown in the duplicate report window
+
+# Client model settings
+CLIENT_MODEL            = True     # Keep every quote in a compact in-memory model once the list has loaded
+CLIENT_MODEL_MAX_QUOTES = 250000   # Larger tables stay on paged database queries
+SNAPSHOT                = True     # Save the model to disk to show the list at once on the next launch
+SNAPSHOT_DIR            = os.environ.get("QUOTEKEEPER_SNAPSHOT_DIR",
+                                         os.path.join(os.path.expanduser("~"), ".quotekeeper"))
+SNAPSHOT_FORMAT         = 1        # Bumped whenever the snapshot file layout changes
+
+# Change tracking settings
+CHANGE_POLL_MS    = 5000     # How often the main window checks for other users' changes (0 = never)
+CHANGE_POLL_LIMIT = 2000     # More changes than this since the last poll reload the list instead
+CHANGE_LOG_KEEP   = 100000   # Newest change-log entries kept when the log is pruned at startup
+
+# Quote cache settings
+QUOTE_CACHE_SIZE = 5000   # Rows kept by the in-process quote cache (least recently used dropped first)
+
+# Export settings
+EXPORT_CHUNK_SIZE = 5000   # Rows streamed from the server and written per chunk
+
+# Instrumentation settings
+INSTRUMENT      = os.environ.get("QUOTEKEEPER_INSTRUMENT", "1") != "0"  # Record latency histograms
+SLOW_QUERY_MS   = 200     # Statements slower than this go to the slow-query log
+SLOW_QUERY_KEEP = 100     # Slow statements kept in memory for the diagnostics window
+SLOW_QUERY_LOG  = os.environ.get("QUOTEKEEPER_SLOW_QUERY_LOG")  # Also append them to this file (JSON Lines)
+METRICS_DUMP    = os.environ.get("QUOTEKEEPER_METRICS_DUMP")    # Write every metric to this JSON file on exit
+DIAGNOSTICS_REFRESH_MS = 1000   # How often the diagnostics window redraws
+MONO_FONT        = ("Courier", 11)
+
+# Benchmark settings
+BENCH_SIZES      = (10_000, 100_000, 1_000_000)  # Quotes seeded per benchmark run
+BENCH_REPEAT     = 5      # Timed runs per operation
+BENCH_SEED       = 1      # Random seed, so every run benchmarks the same data
+BENCH_VOCABULARY = 5000   # Distinct words in the synthetic quotes
+BENCH_CATEGORIES = 40     # Distinct synthetic categories
+BENCH_STATEMENT_CALLS = 200  # Back-to-back calls per run when timing prepared statement reuse
+BENCH_SORTS = {"author": [("Author", False)], "quote_desc": [("Quote", True)],  # Column sorts timed per run
+               "category_author": [("Category", False), ("Author", False)]}
+
+# Search settings
+SEARCH_ENGINE        = "auto"  # "fulltext" (MySQL FULLTEXT), "local" (in-memory index), "like" or "auto"
+FULLTEXT_MIN_TOKEN   = 3       # Shortest word MySQL indexes (innodb_ft_min_token_size)
+SEARCH_PREFIX_MERGE  = 100     # Index terms above which a partial word's postings are merged into one
+SEARCH_CACHED_QUERIES = 8      # Ranked result lists kept by the local index for paging
 
 # Color scheme - Modern Dark Theme
 # Coffee-inspired color theme
@@ -14,213 +148,3288 @@ RED_COLOR        = "#F44336"   # Delete button (light red)
 CYAN_COLOR       = "#03A9F4"   # View button (cyan)
 ORANGE_COLOR     = "#FF7043"   # Filter buttons (orange)
 
-# Font styles and sizes for clarity and readability
-TITLE_FONT       = ("Helvetica", 28, "bold")
-HEADER_FONT      = ("Helvetica", 22, "bold")
-BUTTON_FONT      = ("Arial", 14)
-BUTTON_FONT_BOLD = ("Arial", 14, "bold")
-TEXT_FONT        = ("Arial", 13)
-QUOTE_FONT       = ("Times New Roman", 20, "italic")
-AUTHOR_FONT      = ("Times New Roman", 16)
-CATEGORY_FONT    = ("Verdana", 13)
+# Font styles and sizes for clarity and readability
+TITLE_FONT       = ("Helvetica", 28, "bold")
+HEADER_FONT      = ("Helvetica", 22, "bold")
+BUTTON_FONT      = ("Arial", 14)
+BUTTON_FONT_BOLD = ("Arial", 14, "bold")
+TEXT_FONT        = ("Arial", 13)
+QUOTE_FONT       = ("Times New Roman", 20, "italic")
+AUTHOR_FONT      = ("Times New Roman", 16)
+CATEGORY_FONT    = ("Verdana", 13)
+
+# --- Unique fonts for specialized windows ---
+# For the Categories window:
+CATEGORIES_HEADER_FONT = ("Helvetica", 22, "bold italic")
+CATEGORIES_ITEM_FONT   = ("Verdana", 14, "italic")
+CATEGORIES_SUBTITLE_FONT = ("Verdana", 12, "bold")
+# For the Authors window:
+AUTHORS_HEADER_FONT  = ("Helvetica", 22, "bold italic")
+AUTHORS_ITEM_FONT    = ("Verdana", 14, "italic")
+AUTHORS_SUBTITLE_FONT = ("Verdana", 12, "bold")
+
+# Global references (used later for the main app)
+app_root = None
+app_tree = None
+app_status_label = None
+app_quote_count_label = None
+app_worker = None
+app_offline = False  # Browsing the local snapshot read-only because the database can't be reached
+
+
+# ------------------------------------------------------------------------------
+# Database Connection & Initialization Functions
+# ------------------------------------------------------------------------------
+class PoolError(Exception):
+    """Raised when the connection pool can't hand out a connection."""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no pooled connection becomes free within POOL_TIMEOUT seconds."""
+
+
+class PooledConnection:
+    """Wraps a pooled connection; close() hands it back to the pool instead of disconnecting."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self.__getattr__("cursor")(*args, **kwargs)
+        return InstrumentedCursor(cursor) if INSTRUMENT else cursor
+
+    def statement(self, sql):
+        """A cursor with `sql` prepared on this connection, kept for reuse across checkouts."""
+        if self._conn is None:
+            raise PoolError("Connection has already been returned to the pool")
+        statements = getattr(self._conn, "prepared_statements", None)
+        if statements is None:
+            statements = self._conn.prepared_statements = PreparedStatements(self._conn)
+        return statements.get(sql)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PreparedStatements:
+    """
+    The server-side prepared statements of one MySQL connection, keyed by SQL text:
+    one prepared cursor per statement, so repeated calls skip parsing and planning.
+    """
+
+    def __init__(self, conn, size=PREPARED_CACHE_SIZE):
+        self.conn = conn
+        self.size = size
+        self._cursors = OrderedDict()
+
+    def get(self, sql):
+        cursor = self._cursors.get(sql)
+        if cursor is None:
+            cursor = get_backend().prepared_cursor(self.conn)
+            if INSTRUMENT:
+                cursor = InstrumentedCursor(cursor)
+            self._cursors[sql] = cursor
+            if len(self._cursors) > self.size:
+                self._close(self._cursors.popitem(last=False)[1])
+        else:
+            self._cursors.move_to_end(sql)
+        return cursor
+
+    @staticmethod
+    def _close(cursor):
+        try:
+            cursor.close()
+        except DB_ERRORS:
+            pass
+
+    def clear(self):
+        """Forget every statement, e.g. after a reconnect dropped them on the server."""
+        for cursor in self._cursors.values():
+            self._close(cursor)
+        self._cursors.clear()
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of long-lived database connections made by `connect`.
+    Idle connections are pinged before reuse, reconnected when the ping fails
+    and closed once they have been idle for longer than idle_timeout.
+    """
+
+    def __init__(self, connect, size=POOL_SIZE, timeout=POOL_TIMEOUT, idle_timeout=POOL_IDLE_TIMEOUT,
+                 ping_interval=POOL_PING_INTERVAL):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._open = 0        # Connections currently open, idle or checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"checkouts": 0, "waits": 0, "wait_time": 0.0, "created": 0,
+                      "reconnects": 0, "evicted": 0, "discarded": 0}
+
+    def _count(self, key, amount=1):
+        with self._cond:
+            self.stats[key] += amount
+
+    def _connect(self):
+        conn = self.connect()
+        self._count("created")
+        return conn
+
+    def _evict_idle(self):
+        """Remove connections idle for too long. Must be called with the lock held."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+            self._open -= 1
+            self.stats["evicted"] += 1
+        return expired
+
+    def _check(self, conn):
+        """Ping an idle connection and reconnect it if the server has gone away."""
+        try:
+            conn.ping(reconnect=False)
+        except DB_ERRORS:
+            self._count("reconnects")
+            statements = getattr(conn, "prepared_statements", None)
+            if statements is not None:
+                statements.clear()
+            conn.reconnect(attempts=POOL_RECONNECT_ATTEMPTS, delay=POOL_RECONNECT_DELAY)
+        return conn
+
+    def acquire(self):
+        """Check out a connection, waiting up to `timeout` seconds for one to become free."""
+        with self._cond:
+            if self._closed:
+                raise PoolError("Connection pool has been closed")
+            expired = self._evict_idle()
+            self.stats["checkouts"] += 1
+            waited_since = None
+            while not self._idle and self._open >= self.size:
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self.stats["waits"] += 1
+                remaining = waited_since + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No database connection available after {self.timeout} seconds")
+                self._cond.wait(remaining)
+            if waited_since is not None:
+                self.stats["wait_time"] += time.monotonic() - waited_since
+            if self._idle:
+                conn, last_used = self._idle.pop()  # LIFO keeps the warmest connections busy
+            else:
+                conn, last_used = None, None
+                self._open += 1  # Reserve the slot before connecting outside the lock
+        for old_conn in expired:
+            self._disconnect(old_conn)
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif time.monotonic() - last_used >= self.ping_interval:
+                conn = self._check(conn)
+        except Exception:
+            if conn is not None:
+                self._disconnect(conn)
+            with self._cond:
+                self._open -= 1
+                self.stats["discarded"] += 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding it if it is broken."""
+        healthy = not self._closed
+        if healthy:
+            try:
+                # End any open transaction so the next user gets a fresh snapshot.
+                if conn.in_transaction:
+                    conn.rollback()
+                healthy = conn.is_connected()
+            except DB_ERRORS:
+                healthy = False
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._open -= 1
+                self.stats["discarded"] += 1
+                healthy = False
+            self._cond.notify()
+        if not healthy:
+            self._disconnect(conn)
+
+    @staticmethod
+    def _disconnect(conn):
+        try:
+            conn.close()
+        except DB_ERRORS:
+            pass
+
+    def close_all(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._open -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._disconnect(conn)
+
+    def get_stats(self):
+        """Return a snapshot of the pool counters for sizing and diagnostics."""
+        with self._cond:
+            stats = dict(self.stats)
+            stats.update(size=self.size, open=self._open, idle=len(self._idle),
+                         in_use=self._open - len(self._idle))
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the shared connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(get_backend().connect)
+        return _pool
+
+
+def close_pool():
+    """Close all pooled connections; registered to run at exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
+def get_connection():
+    """Returns a pooled connection to the configured database ('quotes_keeper').
+    Calling close() on it returns it to the pool."""
+    with timed("db.connect"):
+        return get_pool().acquire()
+
+
+def _reuse_statements():
+    return PREPARED_STATEMENTS and get_backend().prepares_statements
+
+
+def fetch_rows(sql, params=()):
+    """Run a SELECT on a pooled connection, reusing its prepared statement, and return every row."""
+    conn = get_connection()
+    reuse = _reuse_statements()
+    cursor = conn.statement(sql) if reuse else conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        if not reuse:
+            cursor.close()
+        conn.close()
+
+
+def execute_write(sql, params=()):
+    """Run and commit one INSERT/UPDATE/DELETE through the prepared statements. Returns lastrowid."""
+    conn = get_connection()
+    reuse = _reuse_statements()
+    cursor = conn.statement(sql) if reuse else conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        conn.commit()
+        return cursor.lastrowid
+    except DB_ERRORS:
+        conn.rollback()
+        raise
+    finally:
+        if not reuse:
+            cursor.close()
+        conn.close()
+
+
+# ------------------------------------------------------------------------------
+# Instrumentation
+# ------------------------------------------------------------------------------
+class LatencyHistogram:
+    """Latencies counted in power-of-two millisecond buckets, plus count, total, min and max."""
+    BOUNDS_MS = tuple(2 ** n / 32 for n in range(20))  # 0.03 ms .. 16 s; slower goes in the last bucket
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.buckets[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (capped at the max)."""
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= fraction * self.count:
+                return min(self.BOUNDS_MS[index], self.max_ms) if index < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        return {"count": self.count, "total_ms": round(self.total_ms, 3),
+                "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "min_ms": round(self.min_ms or 0.0, 3), "p50_ms": round(self.percentile(0.5), 3),
+                "p95_ms": round(self.percentile(0.95), 3), "p99_ms": round(self.percentile(0.99), 3),
+                "max_ms": round(self.max_ms, 3),
+                "buckets": {f"<={bound:g}": count for bound, count in zip(self.BOUNDS_MS + (math.inf,), self.buckets)
+                            if count}}
+
+
+class Metrics:
+    """Thread-safe latency histograms by operation name, plus the slow-query log."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.slow_queries = deque(maxlen=SLOW_QUERY_KEEP)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(seconds * 1000)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def log_slow_query(self, sql, params, ms):
+        entry = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "ms": round(ms, 1),
+                 "sql": " ".join(sql.split())[:500], "params": params[:200]}
+        with self._lock:
+            self.slow_queries.append(entry)
+        if SLOW_QUERY_LOG:
+            with open(SLOW_QUERY_LOG, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+
+    def snapshot(self):
+        """Every histogram, the slow queries and the pool and cache counters, as plain data."""
+        with self._lock:
+            operations = {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+            slow_queries = list(self.slow_queries)
+        return {"uptime_s": round(time.time() - self.started, 1), "operations": operations,
+                "slow_queries": slow_queries, "pool": _pool.get_stats() if _pool else None,
+                "quote_cache": _quote_cache.get_stats(),
+                "quote_model": _quote_model.get_stats() if _quote_model else None}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.slow_queries.clear()
+            self.started = time.time()
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+
+_metrics = Metrics()
+
+
+def timed(name):
+    """Context manager recording the latency of the enclosed block under `name`."""
+    return _metrics.timer(name) if INSTRUMENT else contextlib.nullcontext()
+
+
+def dump_metrics():
+    """Write the metrics to METRICS_DUMP, if set; registered to run at exit."""
+    if METRICS_DUMP and INSTRUMENT:
+        _metrics.dump(METRICS_DUMP)
+
+
+atexit.register(dump_metrics)
+
+
+class InstrumentedCursor:
+    """
+    Times a cursor's execute/executemany (per statement type, e.g. db.execute.select)
+    and its fetches, and logs statements slower than SLOW_QUERY_MS.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed_execute(self, method, sql, params, describe):
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            verb = sql.split(None, 1)[0].lower() if sql.strip() else "empty"
+            _metrics.record(f"db.execute.{verb}", elapsed)
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                _metrics.log_slow_query(sql, describe(params), elapsed * 1000)
+
+    def execute(self, sql, params=()):
+        return self._timed_execute(self._cursor.execute, sql, params, repr)
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        return self._timed_execute(self._cursor.executemany, sql, seq_of_params,
+                                   lambda rows: f"<{len(rows)} rows>")
+
+    def fetchone(self):
+        with _metrics.timer("db.fetch"):
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        with _metrics.timer("db.fetch"):
+            return self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+
+    def fetchall(self):
+        with _metrics.timer("db.fetch"):
+            return self._cursor.fetchall()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+# ------------------------------------------------------------------------------
+# Storage Backends
+# ------------------------------------------------------------------------------
+class SQLiteCursor:
+    """A sqlite3 cursor that accepts the MySQL-style %s placeholders used throughout the app."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(sql.replace("%s", "?"), seq_of_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class SQLiteConnection:
+    """
+    An embedded SQLite database behind the same connection API as mysql.connector
+    (cursor/commit/rollback/ping/reconnect/is_connected), so the data functions and the
+    connection pool work unchanged on either backend.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self.reconnect()
+
+    def reconnect(self, attempts=1, delay=0):
+        self.close()
+        # sqlite3 caches prepared statements per connection; keep plenty of them.
+        self._conn = sqlite3.connect(self.path, timeout=POOL_TIMEOUT, check_same_thread=False,
+                                     cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    def cursor(self, **options):
+        return SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def is_connected(self):
+        return self._conn is not None
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def load_mysql():
+    """
+    Import mysql.connector on first use rather than at launch: it is the slowest import
+    in the app and the SQLite backend never needs it.
+    """
+    global mysql, DB_ERRORS
+    if mysql is None:
+        try:
+            with timed("startup.import_mysql"):
+                import mysql.connector
+        except ImportError:
+            raise RuntimeError("The MySQL backend needs mysql-connector-python "
+                               "(pip install mysql-connector-python)") from None
+        DB_ERRORS = (sqlite3.Error, mysql.connector.Error)
+    return mysql.connector
+
+
+class MySQLBackend:
+    """The original XAMPP MySQL/MariaDB server storage."""
+    name = "mysql"
+    fulltext_min_token = FULLTEXT_MIN_TOKEN
+    supports_load_data = True
+    insert_ignore = "INSERT IGNORE"
+    prepares_statements = True
+    # The default collation already compares case-insensitively.
+    sort_columns = {"ID": "quotes.id", "Quote": "quotes.quote_text", "Author": "quotes.author",
+                    "Category": "quotes.category"}
+
+    def connect(self, **options):
+        return load_mysql().connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME, **options)
+
+    def connect_server(self):
+        """A connection to the server without selecting a database, for CREATE/DROP DATABASE."""
+        return load_mysql().connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
+
+    def prepared_cursor(self, conn):
+        return conn.cursor(prepared=True)
+
+    def initialize(self):
+        """Create the database 'quotes_keeper' on first launch, then migrate the schema."""
+        try:
+            return migrate_database()
+        except DB_ERRORS as err:
+            if getattr(err, "errno", None) != 1049:  # ER_BAD_DB_ERROR: the database does not exist yet
+                raise
+        conn = self.connect_server()
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return migrate_database()
+
+    def create_tables(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                username VARCHAR(255) UNIQUE NOT NULL,
+                password VARCHAR(255) NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quotes (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                quote_text TEXT NOT NULL,
+                author VARCHAR(255) NOT NULL,
+                category VARCHAR(255) NOT NULL
+            )
+        """)
+
+    def create_index(self, cursor, name, table, columns):
+        """CREATE INDEX unless it already exists (MySQL has no IF NOT EXISTS for indexes)."""
+        cursor.execute("SELECT COUNT(*) FROM information_schema.STATISTICS "
+                       "WHERE table_schema=DATABASE() AND table_name=%s AND index_name=%s", (table, name))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+    def create_fulltext(self, cursor):
+        return ensure_fulltext_index(cursor)
+
+    def create_text_sort_index(self, cursor):
+        """Nothing to do: a TEXT column can only have a prefix index, which ORDER BY can't use."""
+
+    def create_entity_table(self, cursor, column, table):
+        """The lookup table for one facet column plus the quotes.<column>_id key pointing into it."""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(255) UNIQUE NOT NULL,
+                quote_count INT NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("SELECT COUNT(*) FROM information_schema.COLUMNS "
+                       "WHERE table_schema=DATABASE() AND table_name='quotes' AND column_name=%s",
+                       (f"{column}_id",))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE quotes ADD COLUMN {column}_id INT NULL")
+
+    def create_entity_triggers(self, cursor):
+        """Keep the quotes.*_id keys and the per-entity quote counters in step with every write."""
+        insert_body, update_body, delete_body = [], [], []
+        for column, table in FACET_TABLES.items():
+            upsert = (f"INSERT INTO {table} (name, quote_count) VALUES (NEW.{column}, 1) "
+                      f"ON DUPLICATE KEY UPDATE quote_count = quote_count + 1;\n"
+                      f"SET NEW.{column}_id = (SELECT id FROM {table} WHERE name = NEW.{column});")
+            decrement = f"UPDATE {table} SET quote_count = quote_count - 1 WHERE id = OLD.{column}_id;"
+            insert_body.append(upsert)
+            update_body.append(f"IF NEW.{column} <> OLD.{column} THEN\n{decrement}\n{upsert}\nEND IF;")
+            delete_body.append(decrement)
+        for name, timing, body in (("quotes_entities_insert", "BEFORE INSERT", insert_body),
+                                   ("quotes_entities_update", "BEFORE UPDATE", update_body),
+                                   ("quotes_entities_delete", "AFTER DELETE", delete_body)):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"CREATE TRIGGER {name} {timing} ON quotes FOR EACH ROW BEGIN\n"
+                           + "\n".join(body) + "\nEND")
+
+    def add_entity_key(self, cursor, column, table):
+        cursor.execute("SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS "
+                       "WHERE table_schema=DATABASE() AND table_name='quotes' AND constraint_name=%s",
+                       (f"fk_quotes_{column}",))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE quotes ADD CONSTRAINT fk_quotes_{column} "
+                           f"FOREIGN KEY ({column}_id) REFERENCES {table} (id)")
+
+    def add_updated_at(self, cursor):
+        """quotes.updated_at, stamped by the server on every insert and change."""
+        cursor.execute("SELECT COUNT(*) FROM information_schema.COLUMNS "
+                       "WHERE table_schema=DATABASE() AND table_name='quotes' AND column_name='updated_at'")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE quotes ADD COLUMN updated_at TIMESTAMP(6) NOT NULL "
+                           "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)")
+
+    def create_change_log(self, cursor):
+        """quote_changes, appended to by triggers on every insert, update and delete."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quote_changes (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                quote_id INT NOT NULL,
+                action VARCHAR(6) NOT NULL,
+                changed_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+            )
+        """)
+        for action, row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+            cursor.execute(f"DROP TRIGGER IF EXISTS quotes_changes_{action}")
+            cursor.execute(f"CREATE TRIGGER quotes_changes_{action} AFTER {action.upper()} ON quotes FOR EACH ROW "
+                           f"INSERT INTO quote_changes (quote_id, action) VALUES ({row}.id, '{action}')")
+
+    def has_fulltext(self, cursor):
+        cursor.execute("SELECT COUNT(*) FROM information_schema.STATISTICS "
+                       "WHERE table_schema=DATABASE() AND table_name='quotes' AND index_name=%s",
+                       (FULLTEXT_INDEX,))
+        return cursor.fetchone()[0] > 0
+
+    def lock_migrations(self, cursor):
+        """Serialise migrations between clients starting at the same time."""
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, POOL_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Another client is migrating the database; try again shortly")
+
+    def unlock_migrations(self, cursor):
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+        cursor.fetchone()
+
+    def fulltext_query(self, terms):
+        """Ranked BOOLEAN MODE match: every word is required, the last one may be half-typed."""
+        expression = " ".join(f"+{term}" for term in terms[:-1]) + f" +{terms[-1]}*"
+        match = f"MATCH({FULLTEXT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)"
+        return QuoteQuery(match, (expression,), order_by=f"{match} DESC, id", order_params=(expression,),
+                          predicate=lambda row: matches_terms(row, terms))
+
+
+class SQLiteBackend:
+    """Embedded single-file storage: WAL journaling, NOCASE indexes and FTS5 search."""
+    name = "sqlite"
+    fulltext_min_token = 1
+    supports_load_data = False
+    insert_ignore = "INSERT OR IGNORE"
+    prepares_statements = False  # sqlite3 already reuses compiled statements (cached_statements)
+    sort_columns = {"ID": "quotes.id", "Quote": "quotes.quote_text COLLATE NOCASE", "Author": "quotes.author",
+                    "Category": "quotes.category"}
+
+    def connect(self, **options):
+        return SQLiteConnection(SQLITE_PATH)
+
+    def initialize(self):
+        return migrate_database()
+
+    def create_tables(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL
+            )
+        """)
+        # NOCASE matches the case-insensitive comparisons of MySQL's default collation.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quotes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                quote_text TEXT NOT NULL,
+                author TEXT NOT NULL COLLATE NOCASE,
+                category TEXT NOT NULL COLLATE NOCASE
+            )
+        """)
+
+    def create_index(self, cursor, name, table, columns):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+    def create_fulltext(self, cursor):
+        return ensure_fts5_table(cursor)
+
+    def create_text_sort_index(self, cursor):
+        self.create_index(cursor, "idx_quotes_text_nocase", "quotes", "quote_text COLLATE NOCASE")
+
+    def create_entity_table(self, cursor, column, table):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL COLLATE NOCASE,
+                quote_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info('quotes') WHERE name=%s", (f"{column}_id",))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE quotes ADD COLUMN {column}_id INTEGER REFERENCES {table} (id)")
+
+    def create_entity_triggers(self, cursor):
+        """Keep the quotes.*_id keys and the per-entity quote counters in step with every write."""
+        # SQLite triggers can't assign NEW, so the keys are filled in by an UPDATE OF the *_id
+        # columns; the FTS5 update trigger is narrowed to the text columns so it skips that write.
+        cursor.execute("DROP TRIGGER IF EXISTS quotes_fts_update")
+        ensure_fts5_table(cursor)
+        insert_body, delete_body = [], []
+        for column, table in FACET_TABLES.items():
+            upsert = (f"INSERT OR IGNORE INTO {table} (name) VALUES (new.{column});\n"
+                      f"UPDATE {table} SET quote_count = quote_count + 1 WHERE name = new.{column};\n"
+                      f"UPDATE quotes SET {column}_id = (SELECT id FROM {table} WHERE name = new.{column}) "
+                      f"WHERE id = new.id;")
+            decrement = f"UPDATE {table} SET quote_count = quote_count - 1 WHERE id = old.{column}_id;"
+            insert_body.append(upsert)
+            delete_body.append(decrement)
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS quotes_{column}_update AFTER UPDATE OF {column} "
+                           f"ON quotes WHEN new.{column} <> old.{column} BEGIN\n{decrement}\n{upsert}\nEND")
+        cursor.execute("CREATE TRIGGER IF NOT EXISTS quotes_entities_insert AFTER INSERT ON quotes BEGIN\n"
+                       + "\n".join(insert_body) + "\nEND")
+        cursor.execute("CREATE TRIGGER IF NOT EXISTS quotes_entities_delete AFTER DELETE ON quotes BEGIN\n"
+                       + "\n".join(delete_body) + "\nEND")
+
+    def add_entity_key(self, cursor, column, table):
+        # The REFERENCES clause came with the column; SQLite only needs the index.
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_quotes_{column}_id ON quotes ({column}_id)")
+
+    def add_updated_at(self, cursor):
+        # ALTER TABLE can't add a column with a non-constant default, so triggers stamp the rows.
+        now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info('quotes') WHERE name='updated_at'")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE quotes ADD COLUMN updated_at TEXT NOT NULL DEFAULT ''")
+        cursor.execute(f"UPDATE quotes SET updated_at = {now} WHERE updated_at = ''")
+        for name, event in (("quotes_touch_insert", "AFTER INSERT"),
+                            ("quotes_touch_update", "AFTER UPDATE OF quote_text, author, category")):
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON quotes BEGIN\n"
+                           f"UPDATE quotes SET updated_at = {now} WHERE id = new.id;\nEND")
+
+    def create_change_log(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quote_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                quote_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            )
+        """)
+        # Updates are logged only for the user-visible columns, not the *_id and updated_at upkeep.
+        for action, event, row in (("insert", "AFTER INSERT", "new"),
+                                   ("update", "AFTER UPDATE OF quote_text, author, category", "new"),
+                                   ("delete", "AFTER DELETE", "old")):
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS quotes_changes_{action} {event} ON quotes BEGIN\n"
+                           f"INSERT INTO quote_changes (quote_id, action) VALUES ({row}.id, '{action}');\nEND")
+
+    def has_fulltext(self, cursor):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name='quotes_fts'")
+        return cursor.fetchone()[0] > 0
+
+    def lock_migrations(self, cursor):
+        pass  # a single local process owns the file
+
+    def unlock_migrations(self, cursor):
+        pass
+
+    def fulltext_query(self, terms):
+        """Ranked FTS5 match: every word is required, the last one may be half-typed."""
+        expression = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        # Joined rather than a correlated rank subquery, which re-ran the MATCH for every row.
+        return QuoteQuery("quotes_fts MATCH %s", (expression,), order_by="quotes_fts.rank, quotes.id",
+                          tables="quotes JOIN quotes_fts ON quotes_fts.rowid = quotes.id",
+                          predicate=lambda row: matches_terms(row, terms))
+
+
+STORAGE_BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+_backend = None
+
+
+def get_backend():
+    """Returns the storage backend selected by STORAGE_BACKEND."""
+    global _backend
+    if _backend is None:
+        if STORAGE_BACKEND not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+        _backend = STORAGE_BACKENDS[STORAGE_BACKEND]()
+    return _backend
+
+
+def initialize_database():
+    """
+    Prepares the configured storage: for MySQL, creates the database 'quotes_keeper'
+    if it doesn't exist; then applies any pending schema migrations.
+    Returns the schema version.
+    """
+    return get_backend().initialize()
+
+
+# ---------------------------------------------------------------------------
+# Schema Migrations
+# ---------------------------------------------------------------------------
+# Each migration runs once, in version order, and is recorded in schema_version,
+# so an up-to-date database costs a single SELECT at startup.
+
+MIGRATION_LOCK = "quotes_keeper_migrations"
+MIGRATION_BATCH_SIZE = 5000  # Rows backfilled per committed transaction
+MIGRATIONS = []  # (version, description, function(conn, cursor, backend)) in ascending order
+
+
+def migration(version, description):
+    """Register a schema migration; versions must be added in increasing order."""
+    def register(function):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, "migrations must be registered in order"
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+
+def get_schema_version(cursor):
+    """The highest applied migration, creating the bookkeeping table on first run."""
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        return cursor.fetchone()[0] or 0
+    except DB_ERRORS:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        return 0
+
+
+def migrate_database():
+    """Apply every pending migration in order. Returns the resulting schema version."""
+    backend = get_backend()
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        version = get_schema_version(cursor)
+        if version >= MIGRATIONS[-1][0]:
+            return version
+        backend.lock_migrations(cursor)
+        try:
+            version = get_schema_version(cursor)  # another client may have migrated meanwhile
+            for number, description, function in MIGRATIONS:
+                if number <= version:
+                    continue
+                function(conn, cursor, backend)
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                               (number, description))
+                conn.commit()
+                version = number
+        finally:
+            backend.unlock_migrations(cursor)
+        return version
+    except DB_ERRORS:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@migration(1, "Create users and quotes tables")
+def _migrate_base_tables(conn, cursor, backend):
+    backend.create_tables(cursor)
+
+
+@migration(2, "Index quotes by author and category")
+def _migrate_facet_indexes(conn, cursor, backend):
+    # Serves the author/category filters, the facet GROUP BYs and the popup counts.
+    backend.create_index(cursor, "idx_quotes_author", "quotes", "author")
+    backend.create_index(cursor, "idx_quotes_category", "quotes", "category")
+
+
+@migration(3, "Full-text index on the quote text")
+def _migrate_fulltext(conn, cursor, backend):
+    backend.create_fulltext(cursor)
+
+
+@migration(4, "Normalise authors and categories into lookup tables")
+def _migrate_entity_tables(conn, cursor, backend):
+    # Online: the triggers go in first so writes made during the backfill are already
+    # tracked, and existing rows are keyed in small committed batches. The text columns
+    # stay on quotes as the source of the full-text index and the import/export formats.
+    for column, table in FACET_TABLES.items():
+        backend.create_entity_table(cursor, column, table)
+    backend.create_entity_triggers(cursor)
+    for column, table in FACET_TABLES.items():
+        cursor.execute(f"{backend.insert_ignore} INTO {table} (name) SELECT DISTINCT {column} FROM quotes")
+    conn.commit()
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM quotes")
+    last_id = cursor.fetchone()[0]
+    for start in range(0, last_id, MIGRATION_BATCH_SIZE):
+        cursor.execute("UPDATE quotes SET "
+                       "author_id = (SELECT id FROM authors WHERE name = quotes.author), "
+                       "category_id = (SELECT id FROM categories WHERE name = quotes.category) "
+                       "WHERE id > %s AND id <= %s AND (author_id IS NULL OR category_id IS NULL)",
+                       (start, start + MIGRATION_BATCH_SIZE))
+        conn.commit()
+    for column, table in FACET_TABLES.items():
+        backend.add_entity_key(cursor, column, table)
+        cursor.execute(f"UPDATE {table} SET quote_count = "
+                       f"(SELECT COUNT(*) FROM quotes WHERE {column}_id = {table}.id)")
+
+
+@migration(5, "Track when each quote last changed")
+def _migrate_updated_at(conn, cursor, backend):
+    # Lets a client fetch only the rows changed since its local snapshot was saved.
+    backend.add_updated_at(cursor)
+    backend.create_index(cursor, "idx_quotes_updated_at", "quotes", "updated_at")
+
+
+@migration(6, "Log every change to quotes for incremental refresh")
+def _migrate_change_log(conn, cursor, backend):
+    backend.create_change_log(cursor)
+
+
+@migration(7, "Indexes for sorting the quote list")
+def _migrate_sort_indexes(conn, cursor, backend):
+    # Sorting by author or category alone is served by the indexes of migration 2, as
+    # both engines keep the primary key in secondary indexes to break ties by id.
+    backend.create_index(cursor, "idx_quotes_category_author", "quotes", "category, author")
+    backend.create_text_sort_index(cursor)
+
+
+def insert_quote(quote, author, category):
+    """Insert a new quote into the database and return the new row."""
+    quote_id = execute_write("INSERT INTO quotes (quote_text, author, category) VALUES (%s, %s, %s)",
+                             (quote, author, category))
+    row = (quote_id, quote, author, category)
+    quotes_changed([(None, row)])
+    quote_written(quote_id, row)
+    return row
+
+
+def add_quote(quote, author, category, tree, on_done=None, on_error=None):
+    """
+    Insert a new quote in the background and add just that row to the tree view, then
+    call on_done(row). A failed write goes to on_error, or is reported by the worker.
+    """
+    def added(row):
+        patch_quote(tree, row[0], row, added=True)
+        if on_done:
+            on_done(row)
+
+    run_in_background(insert_quote, quote, author, category, on_done=added, on_error=on_error,
+                      description="Saving quote...")
+
+
+def update_quote_row(quote_id, quote_text, author, category):
+    """Update an existing quote in the database and return the changed row."""
+    old_row = known_row(quote_id)
+    execute_write("UPDATE quotes SET quote_text=%s, author=%s, category=%s WHERE id=%s",
+                  (quote_text, author, category, quote_id))
+    row = (quote_id, quote_text, author, category)
+    quotes_changed(None if old_row is None else [(old_row, row)])
+    quote_written(quote_id, row)
+    return row
+
+
+def quote_written(quote_id, row, local=True):
+    """
+    Bring every client-side copy of one quote in step after it was written, or deleted
+    (row is None): the quote cache, the search and duplicate indexes and the quote model.
+    Local writes are remembered so the change poller doesn't apply them a second time.
+    """
+    _quote_cache.invalidate(quote_id)
+    if row is not None:
+        _quote_cache.put_many([row], _quote_cache.generation)
+        if _search_index:
+            _search_index.add(*row)
+        if _duplicate_index:
+            _duplicate_index.add(quote_id, row[1])
+        if _quote_model is not None:
+            _quote_model.put(row)
+    else:
+        if _search_index:
+            _search_index.remove(quote_id)
+        if _duplicate_index:
+            _duplicate_index.remove(quote_id)
+        if _quote_model is not None:
+            _quote_model.remove(quote_id)
+    if local and _change_poller is not None and _change_poller.version is not None:
+        _local_changes[quote_id] = row
+
+
+def update_quote(quote_id, quote_text, author, category, tree, on_done=None, on_error=None):
+    """Update an existing quote in the background and patch its row in the tree view, like add_quote()."""
+    def updated(row):
+        patch_quote(tree, quote_id, row)
+        if on_done:
+            on_done(row)
+
+    run_in_background(update_quote_row, quote_id, quote_text, author, category, on_done=updated,
+                      on_error=on_error, description="Saving quote...")
+
+
+def load_quote(quote_id):
+    """Read a quote from the database by its ID, bypassing the cache, and cache it."""
+    generation = _quote_cache.generation
+    rows = fetch_rows(f"SELECT {QUOTE_COLUMNS} FROM quotes WHERE quotes.id=%s", (quote_id,))
+    if not rows:
+        return None
+    _quote_cache.put_many(rows, generation)
+    return rows[0][1:]
+
+
+def get_quote_by_id(quote_id):
+    """Retrieve a quote (quote_text, author, category) by its ID, from the cache when possible."""
+    cached = _quote_cache.get(quote_id)
+    return cached if cached is not None else load_quote(quote_id)
+
+
+QUOTE_COLUMNS = "quotes.id, quotes.quote_text, quotes.author, quotes.category"  # The row shape of every view
+
+
+class QuoteQuery:
+    """
+    A filtered view of the quotes table: a WHERE clause, its parameters and an ORDER BY.
+    `predicate` mirrors the WHERE clause in Python so a single changed row can be
+    checked against the view without asking the database.
+    """
+
+    def __init__(self, where="", params=(), order_by="id", order_params=(), predicate=None, tables="quotes"):
+        self.where = where
+        self.tables = tables
+        self.params = tuple(params)
+        self.order_by = order_by
+        self.order_params = tuple(order_params)
+        self.predicate = predicate
+
+    def matches(self, row):
+        """True/False if the row belongs to this view, or None when that can't be told locally."""
+        if not self.where:
+            return True
+        if self.predicate is None:
+            return None
+        return self.predicate(row)
+
+    def _sql(self, select):
+        sql = f"SELECT {select} FROM {self.tables}"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+    def count(self):
+        """Number of matching quotes, computed with COUNT(*) on the server."""
+        return fetch_rows(self._sql("COUNT(*)"), self.params)[0][0]
+
+    def select(self):
+        """The SELECT statement for every matching quote, in order, and its parameters."""
+        return self._sql(QUOTE_COLUMNS) + f" ORDER BY {self.order_by}", self.params + self.order_params
+
+    def fetch(self, offset=0, limit=None):
+        """Fetch matching quotes, optionally only the `limit` rows starting at `offset`."""
+        sql, params = self.select()
+        if limit is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params += (limit, offset)
+        generation = _quote_cache.generation
+        quotes = fetch_rows(sql, params)
+        _quote_cache.put_many(quotes, generation)
+        return quotes
+
+    def fetch_after(self, last_id, limit):
+        """Keyset page of an id-ordered query: the next `limit` matching quotes after `last_id`."""
+        where = f"({self.where}) AND quotes.id > %s" if self.where else "quotes.id > %s"
+        generation = _quote_cache.generation
+        quotes = fetch_rows(f"SELECT {QUOTE_COLUMNS} FROM {self.tables} WHERE {where} ORDER BY quotes.id LIMIT %s",
+                            self.params + (last_id, limit))
+        _quote_cache.put_many(quotes, generation)
+        return quotes
+
+
+def query_ids(query):
+    """Ids of every quote in a view, e.g. for Select All; SQL views read just the id column."""
+    if isinstance(query, QuoteQuery):
+        return [row[0] for row in fetch_rows(query._sql("quotes.id"), query.params)]
+    return [row[0] for row in query.fetch()]
+
+
+def fetch_page(query, offset, limit, after_id=None):
+    """
+    One page of a query. Id-ordered SQL queries seek past `after_id`, the id of the last
+    row already shown (WHERE id > last_seen ORDER BY id LIMIT n), so every page costs the
+    same however deep it is; ranked and in-memory results fall back to LIMIT/OFFSET.
+    """
+    if after_id is not None and isinstance(query, QuoteQuery) and query.order_by == "id":
+        return query.fetch_after(after_id, limit)
+    return query.fetch(offset, limit)
+
+
+def author_query(author):
+    return QuoteQuery("author_id = (SELECT id FROM authors WHERE name = %s)", (author,),
+                      predicate=lambda row: row[2].lower() == author.lower())
+
+
+def category_query(category):
+    return QuoteQuery("category_id = (SELECT id FROM categories WHERE name = %s)", (category,),
+                      predicate=lambda row: row[3].lower() == category.lower())
+
+
+def like_query(query):
+    search_term = f"%{query}%"
+    return QuoteQuery("quote_text LIKE %s OR author LIKE %s OR category LIKE %s",
+                      (search_term, search_term, search_term),
+                      predicate=lambda row: any(query.lower() in field.lower() for field in row[1:]))
+
+
+def combine_queries(*queries):
+    """AND together the WHERE clauses of several QuoteQuery filters, keeping the first one's tables and ORDER BY."""
+    queries = [query for query in queries if query is not None]
+    if not queries:
+        return QuoteQuery()
+    first = queries[0]
+    wheres = [query for query in queries if query.where]
+    predicates = [query.predicate for query in wheres]
+    predicate = None if None in predicates else (lambda row: all(check(row) for check in predicates))
+    return QuoteQuery(" AND ".join(f"({query.where})" for query in wheres),
+                      [param for query in wheres for param in query.params],
+                      order_by=first.order_by, order_params=first.order_params, predicate=predicate,
+                      tables=first.tables)
+
+
+SORT_COLUMNS = {"ID": 0, "Quote": 1, "Author": 2, "Category": 3}  # Treeview column -> row index
+
+
+def normalize_sort(sort_keys):
+    """
+    Sort keys as [(column, descending)], most significant first, without the keys after
+    an ID key (ids are unique, so those never apply). Plain id order is [].
+    """
+    keys = []
+    for column, descending in sort_keys:
+        keys.append((column, descending))
+        if column == "ID":
+            break
+    return [] if keys == [("ID", False)] else keys
+
+
+def sort_order_sql(sort_keys):
+    """The ORDER BY for sort keys, ties broken by id like every other view."""
+    columns = get_backend().sort_columns
+    terms = [columns[column] + (" DESC" if descending else "") for column, descending in sort_keys]
+    if not any(column == "ID" for column, _ in sort_keys):
+        terms.append("quotes.id")
+    return ", ".join(terms)
+
+
+def collation_key(index, value):
+    """Sort key for one field of a row: ids as numbers, text case-insensitively like the database."""
+    return int(value) if index == 0 else str(value).lower()
+
+
+def sort_rows(rows, sort_keys):
+    """
+    Sort rows in memory, in place: by id, then once per key from the least significant
+    up. Python's sort is stable, so each pass keeps the order of the ones before it.
+    """
+    if sort_keys:
+        with timed("sort.rows"):
+            rows.sort(key=lambda row: collation_key(0, row[0]))
+            for column, descending in reversed(sort_keys):
+                index = SORT_COLUMNS[column]
+                rows.sort(key=lambda row: collation_key(index, row[index]), reverse=descending)
+    return rows
+
+
+def sort_moves(query, old_row, new_row):
+    """True if a changed row may have moved in a sorted view."""
+    return any(collation_key(SORT_COLUMNS[column], old_row[SORT_COLUMNS[column]]) !=
+               collation_key(SORT_COLUMNS[column], new_row[SORT_COLUMNS[column]])
+               for column, _ in getattr(query, "sort_keys", ()))
+
+
+def sort_query(query, sort_keys):
+    """
+    The same view ordered by sort keys. SQL queries get an ORDER BY that the column
+    indexes serve, so they still page through the database; the quote model and result
+    sets held in memory are sorted on the client. Any other view is loaded whole first.
+    """
+    query = getattr(query, "unsorted", query)
+    sort_keys = normalize_sort(sort_keys)
+    if not sort_keys:
+        return query
+    if isinstance(query, QuoteQuery):
+        ordered = QuoteQuery(query.where, query.params, order_by=sort_order_sql(sort_keys),
+                             predicate=query.predicate, tables=query.tables)
+        ordered.sort_keys = sort_keys
+    elif isinstance(query, ModelQuery):
+        ordered = ModelQuery(query.model, query.column, query.value, sort_keys)
+    elif isinstance(query, ResultRows):
+        ordered = ResultRows(query.source, query.rows, sort_keys)
+    else:
+        ordered = ResultRows(query, sort_keys=sort_keys)
+    ordered.unsorted = query
+    return ordered
+
+
+def matches_terms(row, terms):
+    """True if a row contains every search term, the last one as a word prefix; no terms match every row."""
+    if not terms:
+        return True
+    tokens = set(tokenize(" ".join(row[1:])))
+    if not all(term in tokens for term in terms[:-1]):
+        return False
+    return any(token.startswith(terms[-1]) for token in tokens)
+
+
+def search_query(query):
+    """
+    Build the query behind the search box using the configured SEARCH_ENGINE:
+    a ranked MySQL FULLTEXT match, the local inverted index, or a plain LIKE scan.
+    """
+    engine = SEARCH_ENGINE
+    if engine == "auto":
+        engine = "fulltext" if fulltext_available() else "local"
+    if engine == "fulltext":
+        backend = get_backend()
+        terms = [term for term in tokenize(query) if len(term) >= backend.fulltext_min_token]
+        if terms:
+            return backend.fulltext_query(terms)
+    elif engine == "local" and tokenize(query):
+        return LocalSearchQuery(query)
+    return like_query(query)
+
+
+def find_quotes(query, offset=0, limit=PAGE_SIZE):
+    """Return (total, rows) for one page of ranked search results."""
+    quote_query = search_query(query)
+    return quote_query.count(), quote_query.fetch(offset, limit)
+
+
+class ResultRows:
+    """
+    A query result held in memory, e.g. a search small enough for live search to refine.
+    Single writes can't be placed in it, so after any write it re-runs its source query.
+    Without rows, the source is run when the result is first used.
+    """
+
+    def __init__(self, source, rows=None, sort_keys=()):
+        self.source = source
+        self.sort_keys = sort_keys
+        self.order_by = sort_order_sql(sort_keys) if sort_keys else source.order_by
+        self.rows = None
+        self.generation = None
+        if rows is not None:
+            self.rows = sort_rows(list(rows), sort_keys) if sort_keys else rows
+            self.generation = _write_generation
+
+    def matches(self, row):
+        return None
+
+    def _load(self):
+        if self.generation != _write_generation:
+            self.generation = _write_generation
+            self.rows = sort_rows(self.source.fetch(), self.sort_keys)
+        return self.rows
+
+    def count(self):
+        return len(self._load())
+
+    def fetch(self, offset=0, limit=None):
+        rows = self._load()
+        return rows[offset:] if limit is None else rows[offset:offset + limit]
+
+
+def fetch_search_results(query):
+    """
+    Live-search fetch for the main window. Returns (results, complete): result sets of
+    up to LIVE_SEARCH_REUSE_LIMIT rows are loaded whole so they can be refined locally.
+    """
+    if app_offline and _quote_model is not None:
+        return model_query("search", query) if query else model_query(), False
+    if not query:
+        return QuoteQuery(), False
+    search = search_query(query)
+    if search.count() <= LIVE_SEARCH_REUSE_LIMIT:
+        return ResultRows(search, search.fetch()), True
+    return search, False
+
+
+def refine_search_results(results, query):
+    """Narrow a complete result set to a longer query in memory."""
+    search = search_query(query)
+    return ResultRows(search, [row for row in results.rows if search.matches(row)])
+
+
+def show_search_results(tree, query, results):
+    def found(count):
+        if app_status_label and query:
+            app_status_label.config(text=f"Found {count} results for '{query}'")
+
+    show_quotes(tree, results, on_loaded=found)
+
+
+def show_quotes(tree, query, on_loaded=None):
+    """
+    Display the quotes matched by a QuoteQuery in the Treeview. The query runs in the
+    background; on_loaded(count) is called on the Tk thread once the rows are shown.
+    With a virtual list only the visible rows are fetched; otherwise the first page is
+    loaded and load_more_quotes() appends the next one as the list is scrolled down.
+    The rows are shown in the order picked with the column headings.
+    """
+    query = sort_query(query, getattr(tree, "sort_keys", ()))
+    virtual_list = get_virtual_list(tree)
+    if virtual_list:
+        virtual_list.set_query(query, on_loaded)
+        return
+
+    def first_page():
+        return query.count(), fetch_page(query, 0, PAGE_SIZE, after_id=0)
+
+    def loaded(result):
+        total, quotes = result
+        tree.delete(*tree.get_children())
+        tree.quote_query = query
+        tree.quote_total = total
+        tree.quote_loaded = 0      # Rows fetched so far; the offset of the next page
+        tree.quote_last_id = 0     # Keyset position: id of the last row fetched
+        append_quotes(tree, quotes)
+        update_quote_count()
+        if on_loaded:
+            on_loaded(total)
+
+    run_in_background(first_page, on_done=loaded, key=("show", str(tree)), description="Loading quotes...")
+
+
+def append_quotes(tree, quotes):
+    """Add a fetched page to the end of the Treeview and advance its paging position."""
+    with timed("tree.insert"):
+        for quote in quotes:
+            tree.insert("", "end", iid=str(quote[0]), values=quote)
+    tree.quote_loaded += len(quotes)
+    if quotes:
+        tree.quote_last_id = quotes[-1][0]
+
+
+def load_more_quotes(tree):
+    """Fetch the next page of the Treeview's query, if any rows are left to show."""
+    query = getattr(tree, "quote_query", None)
+    if query is None or tree.quote_loaded >= tree.quote_total:
+        return
+
+    def loaded(quotes):
+        if query is tree.quote_query:
+            append_quotes(tree, quotes)
+
+    run_in_background(fetch_page, query, tree.quote_loaded, PAGE_SIZE, tree.quote_last_id,
+                      on_done=loaded, key=("more", str(tree)), description="Loading more quotes...")
+
+
+def on_tree_scrolled(tree, scrollbar, first, last):
+    """yscrollcommand for the paged Treeview: infinite scroll once the last row is in view."""
+    scrollbar.set(first, last)
+    if float(last) >= 1.0:
+        load_more_quotes(tree)
+
+
+def load_quotes(tree, on_loaded=None):
+    """
+    Load quotes into the Treeview control: from the quote model once it is loaded, or
+    straight from the local snapshot at startup, otherwise from the database, after
+    which the model is built in the background.
+    """
+    def loaded(total):
+        start_quote_model(total)
+        start_duplicate_index()
+        if on_loaded:
+            on_loaded(total)
+
+    open_local_snapshot()
+    show_quotes(tree, model_query() or QuoteQuery(), loaded)
+
+
+def patch_quote(tree, quote_id, row, added=False):
+    """
+    Apply a single added, changed or deleted (row is None) quote to the Treeview
+    without reloading it, keeping the current filter/search view and scroll position.
+    """
+    patch_quotes(tree, [(quote_id, row)], added)
+
+
+def patch_quotes(tree, changes, added=False):
+    """Apply several (quote_id, row) changes to the Treeview at once, e.g. after a bulk edit."""
+    virtual_list = get_virtual_list(tree)
+    if virtual_list:
+        virtual_list.patch(changes, added)
+        return
+    query = getattr(tree, "quote_query", None)
+    if query is None:
+        return
+    for quote_id, row in changes:
+        matches = row is not None and query.matches(row)
+        if matches is None:
+            show_quotes(tree, query)  # The view can't be checked locally; reload it
+            return
+        item = str(quote_id)
+        if tree.exists(item):
+            if matches and sort_moves(query, tree.item(item, "values"), row):
+                show_quotes(tree, query)  # The row moves in the sort order; reload it
+                return
+            if matches:
+                tree.item(item, values=row)
+            else:
+                tree.delete(item)
+                tree.quote_total -= 1
+                tree.quote_loaded -= 1
+        elif matches:
+            # Rows past the last loaded page arrive with a later page; only count them now.
+            by_id = query.order_by == "id"
+            sort_keys = getattr(query, "sort_keys", ())
+            if sort_keys and tree.quote_loaded < tree.quote_total:
+                show_quotes(tree, query)  # It may belong among the rows already shown; reload them
+                return
+            if tree.quote_loaded >= tree.quote_total or (by_id and quote_id <= tree.quote_last_id):
+                index = "end"
+                if by_id:
+                    index = bisect_left([int(child) for child in tree.get_children()], quote_id)
+                    tree.quote_last_id = max(tree.quote_last_id, quote_id)
+                elif sort_keys:
+                    rows = [(int(child),) + tuple(tree.item(child, "values"))[1:] for child in tree.get_children()]
+                    rows = sort_rows(rows + [tuple(row)], sort_keys)
+                    index = [shown[0] for shown in rows].index(quote_id)
+                tree.insert("", index, iid=item, values=row)
+                tree.quote_loaded += 1
+            tree.quote_total += 1
+    update_quote_count()
+
+
+def remove_quote(quote_id):
+    """Delete a quote from the database."""
+    old_row = known_row(quote_id)
+    execute_write("DELETE FROM quotes WHERE id=%s", (quote_id,))
+    quotes_changed(None if old_row is None else [(old_row, None)])
+    quote_written(quote_id, None)
+
+
+def _id_chunks(quote_ids, size=BULK_CHUNK_SIZE):
+    """Split ids into chunks for WHERE id IN (...), with the matching placeholder list."""
+    for start in range(0, len(quote_ids), size):
+        chunk = tuple(quote_ids[start:start + size])
+        yield chunk, ", ".join(["%s"] * len(chunk))
+
+
+def remove_quotes(quote_ids):
+    """Delete many quotes in one transaction, one DELETE ... WHERE id IN (...) per chunk."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        for chunk, placeholders in _id_chunks(quote_ids):
+            cursor.execute(f"DELETE FROM quotes WHERE id IN ({placeholders})", chunk)
+        conn.commit()
+    except DB_ERRORS:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    for quote_id in quote_ids:
+        quote_written(quote_id, None)
+    quotes_changed()
+    return quote_ids
+
+
+BULK_FIELDS = ("author", "category")
+
+
+def set_quotes_field(quote_ids, column, value):
+    """
+    Set the author or category of many quotes in one transaction, one
+    UPDATE ... WHERE id IN (...) per chunk. Returns the updated rows.
+    """
+    if column not in BULK_FIELDS:
+        raise ValueError(f"Cannot bulk edit column: {column}")
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = []
+    try:
+        for chunk, placeholders in _id_chunks(quote_ids):
+            cursor.execute(f"UPDATE quotes SET {column}=%s WHERE id IN ({placeholders})", (value,) + chunk)
+            cursor.execute(f"SELECT {QUOTE_COLUMNS} FROM quotes WHERE quotes.id IN ({placeholders})", chunk)
+            rows.extend(cursor.fetchall())
+        conn.commit()
+    except DB_ERRORS:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    for row in rows:
+        quote_written(row[0], tuple(row))
+    quotes_changed()
+    return rows
+
+
+def selected_quote_ids(tree):
+    """
+    Ids of the selected quotes: a virtual list's selection set, which may reach past the
+    rows on screen, or else the selected rows' item ids (rows still loading are skipped).
+    """
+    virtual_list = get_virtual_list(tree)
+    if virtual_list:
+        return sorted(virtual_list.selected)
+    return [int(item) for item in tree.selection() if item.isdigit()]
+
+
+def select_all_quotes(tree):
+    """Select every quote in the view: all of the query in a virtual list, else every loaded row."""
+    virtual_list = get_virtual_list(tree)
+    if virtual_list:
+        virtual_list.select_all()
+    else:
+        tree.selection_set(tree.get_children())
+
+
+def delete_quote(tree):
+    """Remove the selected quotes from the database; several go in one batched transaction."""
+    if not require_online():
+        return
+    quote_ids = selected_quote_ids(tree)
+    if not quote_ids:
+        messagebox.showerror("Error", "Please select a quote to delete")
+        return
+    if len(quote_ids) == 1:
+        quote_id = quote_ids[0]
+
+        def deleted(_):
+            patch_quote(tree, quote_id, None)
+            messagebox.showinfo("Deleted", "Quote deleted successfully.")
+
+        run_in_background(remove_quote, quote_id, on_done=deleted, description="Deleting quote...")
+        return
+    if not messagebox.askyesno("Delete Quotes", f"Delete the {len(quote_ids)} selected quotes?"):
+        return
+
+    def deleted_many(deleted_ids):
+        patch_quotes(tree, [(quote_id, None) for quote_id in deleted_ids])
+        messagebox.showinfo("Deleted", f"{len(deleted_ids)} quotes deleted successfully.")
+
+    run_in_background(remove_quotes, quote_ids, on_done=deleted_many,
+                      description=f"Deleting {len(quote_ids)} quotes...")
+
+
+def bulk_edit_quotes(tree, column):
+    """Set the author or category of every selected quote."""
+    if not require_online():
+        return
+    quote_ids = selected_quote_ids(tree)
+    if not quote_ids:
+        messagebox.showerror("Error", "Please select the quotes to edit")
+        return
+    value = simpledialog.askstring(f"QuoteKeeper - Set {column.title()}",
+                                   f"New {column} for the {len(quote_ids)} selected quote(s):",
+                                   parent=tree.winfo_toplevel())
+    if value is None:
+        return
+    value = value.strip()
+    if not value:
+        messagebox.showerror("Error", f"The {column} cannot be empty")
+        return
+    run_in_background(set_quotes_field, quote_ids, column, value,
+                      on_done=lambda rows: patch_quotes(tree, [(row[0], row) for row in rows]),
+                      description=f"Updating {len(quote_ids)} quotes...")
+
+
+def get_all_authors():
+    """Get list of all authors with quotes, from the authors lookup table."""
+    return [author for author, _ in get_facet_counts("author")]
+
+
+def get_all_categories():
+    """Get list of all categories with quotes, from the categories lookup table."""
+    return [category for category, _ in get_facet_counts("category")]
+
+
+def filter_quotes_by_author(tree, author):
+    """Filter the quotes in the treeview by a specific author, through its integer key."""
+    show_quotes(tree, model_query("author", author) or author_query(author))
+
+
+def filter_quotes_by_category(tree, category):
+    """Filter the quotes in the treeview by a specific category, through its integer key."""
+    show_quotes(tree, model_query("category", category) or category_query(category))
+
+
+def update_quote_count():
+    if app_tree and app_quote_count_label:
+        virtual_list = get_virtual_list(app_tree)
+        if virtual_list:
+            count = virtual_list.total
+        else:
+            count = getattr(app_tree, "quote_total", 0)
+        stats = _quote_cache.get_stats()
+        app_quote_count_label.config(text=f"Total Quotes: {count}   |   Cache: {stats['hits']} hits, "
+                                          f"{stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+
+# ------------------------------------------------------------------------------
+# Facet Counts (authors and categories with their number of quotes)
+# ------------------------------------------------------------------------------
+FACET_TABLES = {"author": "authors", "category": "categories"}  # Facet column -> lookup table
+_facet_cache = {}       # column -> list of (name, count) pairs sorted by name
+_facet_generation = 0   # Bumped on every invalidation so in-flight queries don't cache stale data
+_facet_lock = threading.Lock()
+_name_indexes = {}      # column -> NameIndex, kept in step with _facet_cache
+
+
+def get_facet_counts(column):
+    """
+    Return (name, count) pairs for every author or category with quotes, sorted by name.
+    The counts are the per-entity counters kept by the write triggers, so this reads the
+    small lookup table instead of scanning quotes; cached until the next write.
+    """
+    if column not in FACET_TABLES:
+        raise ValueError(f"Unknown facet column: {column}")
+    if app_offline and _quote_model is not None:
+        return _quote_model.facet_counts(column)
+    with _facet_lock:
+        facets = _facet_cache.get(column)
+        generation = _facet_generation
+    if facets is not None:
+        return facets
+    facets = [(name, count) for name, count in
+              fetch_rows(f"SELECT name, quote_count FROM {FACET_TABLES[column]} WHERE quote_count > 0 ORDER BY name")]
+    with _facet_lock:
+        if generation == _facet_generation:
+            _facet_cache[column] = facets
+    return facets
+
+
+def invalidate_facet_cache():
+    """Drop cached facet counts; called after every write to the quotes table."""
+    global _facet_generation
+    with _facet_lock:
+        _facet_cache.clear()
+        _name_indexes.clear()
+        _facet_generation += 1
+
+
+def patch_facet_cache(changes):
+    """
+    Adjust the cached facet counts for (old_row, new_row) changes, either row None for an
+    insert or delete, instead of re-reading them. Names match case-insensitively, like the
+    lookup tables.
+    """
+    global _facet_generation
+    with _facet_lock:
+        _facet_generation += 1  # Results of queries already running predate these changes
+        for column, index in (("author", 2), ("category", 3)):
+            facets = _facet_cache.get(column)
+            if facets is None:
+                continue
+            counts = dict(facets)
+            names = {name.lower(): name for name in counts}
+            for old_row, new_row in changes:
+                for row, step in ((old_row, -1), (new_row, 1)):
+                    if row is not None:
+                        name = names.setdefault(row[index].lower(), row[index])
+                        counts[name] = counts.get(name, 0) + step
+            _facet_cache[column] = sorted(((name, count) for name, count in counts.items() if count > 0),
+                                          key=lambda facet: facet[0].lower())
+        for column, index in (("author", 2), ("category", 3)):
+            name_index = _name_indexes.get(column)
+            if name_index is None:
+                continue
+            for old_row, new_row in changes:
+                for row, step in ((old_row, -1), (new_row, 1)):
+                    if row is not None:
+                        name_index.adjust(row[index], step)
+
+
+_WORD_BREAK_RE = re.compile(r"\W+(?=\w)")  # What comes before each later word of a name
+
+
+class NameIndex:
+    """
+    A prefix index over the author or category names: the lower-cased names in a sorted
+    list, so the names starting with some text are one bisect away, plus a second sorted
+    list of the same names from each later word on ("einstein" for "Albert Einstein").
+    Counts are adjusted on every write; a name is dropped once it has no quotes left.
+    Writes arrive on worker threads and lookups on the Tk thread, so both take the lock.
+    """
+
+    def __init__(self, facets=()):
+        self.spellings = {}   # lower-cased name -> name as stored
+        self.counts = {}      # lower-cased name -> quote count
+        self.names = []       # lower-cased names, sorted
+        self.words = []       # lower-cased names from their second, third, ... word on, sorted
+        self.owners = []      # the lower-cased name each entry of `words` belongs to
+        words = []
+        for name, count in facets:
+            key = name.lower()
+            if key in self.counts:
+                self.counts[key] += count
+                continue
+            self.spellings[key] = name
+            self.counts[key] = count
+            for word in self._later_words(key):
+                words.append((word, key))
+        self.names = sorted(self.counts)
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.owners = [key for _, key in words]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _later_words(key):
+        return [key[match.end():] for match in _WORD_BREAK_RE.finditer(key)]
+
+    @staticmethod
+    def _range(keys, prefix):
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + "\U0010ffff")
+
+    def adjust(self, name, step):
+        """Add `step` quotes to a name, inserting or dropping it as needed."""
+        key = name.lower()
+        with self._lock:
+            count = self.counts.get(key, 0) + step
+            if key not in self.counts and count > 0:
+                self.spellings[key] = name
+                insort(self.names, key)
+                for word in self._later_words(key):
+                    index = bisect_right(self.words, word)
+                    self.words.insert(index, word)
+                    self.owners.insert(index, key)
+            elif key in self.counts and count <= 0:
+                del self.names[bisect_left(self.names, key)]
+                for word in self._later_words(key):
+                    start, end = bisect_left(self.words, word), bisect_right(self.words, word)
+                    index = start + self.owners[start:end].index(key)
+                    del self.words[index], self.owners[index]
+                del self.spellings[key], self.counts[key]
+                return
+            if count > 0:
+                self.counts[key] = count
+
+    def complete(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Up to `limit` names for autocomplete: those starting with `prefix`, then those with a later word that does."""
+        prefix = prefix.lower()
+        with self._lock:
+            start, end = self._range(self.names, prefix)
+            found = self.names[start:min(end, start + limit)]
+            if len(found) < limit:
+                start, end = self._range(self.words, prefix)
+                for key in self.owners[start:end]:
+                    if key not in found:
+                        found.append(key)
+                        if len(found) == limit:
+                            break
+            return [self.spellings[key] for key in found]
+
+    def facets(self, prefix=""):
+        """(name, count) pairs, sorted by name, of every name with a word starting with `prefix`."""
+        prefix = prefix.lower()
+        with self._lock:
+            start, end = self._range(self.names, prefix)
+            keys = self.names[start:end]
+            if prefix:
+                start, end = self._range(self.words, prefix)
+                keys = sorted(set(keys).union(self.owners[start:end]))
+            return [(self.spellings[key], self.counts[key]) for key in keys]
+
+
+def get_name_index(column):
+    """The NameIndex over an author or category facet, built from its counts on first use."""
+    with _facet_lock:
+        index = _name_indexes.get(column)
+        generation = _facet_generation
+    if index is not None:
+        return index
+    with timed("names.build"):
+        index = NameIndex(get_facet_counts(column))
+    with _facet_lock:
+        if generation == _facet_generation:
+            _name_indexes[column] = index
+    return index
+
+
+def peek_name_index(column):
+    """The NameIndex for a column if it is already built, without querying."""
+    with _facet_lock:
+        return _name_indexes.get(column)
+
+
+def facet_search(column, search_text):
+    """
+    Live-search fetch for the popups: the names with a word starting with the search
+    text, from the prefix index, so refining needs no scan of every name.
+    """
+    return get_name_index(column).facets(search_text), True
+
+
+def refine_facet_search(column):
+    """Live-search refine for the popups: another lookup in the already-built prefix index."""
+    return lambda results, search_text: get_name_index(column).facets(search_text)
+
+
+_write_generation = 0  # Bumped on every write so in-memory result sets know they are stale
+
+
+def quotes_changed(facet_changes=None):
+    """
+    Bookkeeping after any write to the quotes table. Given the (old_row, new_row) pairs
+    written, the cached facet counts are patched; otherwise they are re-read.
+    """
+    global _write_generation
+    _write_generation += 1
+    if facet_changes is None:
+        invalidate_facet_cache()
+    else:
+        patch_facet_cache(facet_changes)
+
+
+# ------------------------------------------------------------------------------
+# Change Tracking
+# ------------------------------------------------------------------------------
+# Triggers append every insert, update and delete on quotes to quote_changes, whose
+# id is the database's change version. Each client remembers the last version it has
+# seen and polls for the entries after it, so picking up other people's edits costs
+# one indexed range read plus a fetch of the rows that changed.
+
+_local_changes = {}  # quote id -> row (None once deleted) written by this client, not yet seen in the log
+_change_poller = None
+
+
+def current_change_version():
+    """The newest entry in the change log; everything up to it is already in the table."""
+    return fetch_rows("SELECT COALESCE(MAX(id), 0) FROM quote_changes")[0][0]
+
+
+def prune_change_log(keep=CHANGE_LOG_KEEP):
+    """Drop all but the newest `keep` change-log entries; run once per launch."""
+    version = current_change_version()
+    if version > keep:
+        execute_write("DELETE FROM quote_changes WHERE id <= %s", (version - keep,))
+
+
+def fetch_changes(since):
+    """
+    The changes logged after version `since`, folded per quote: (version, added, changed),
+    each a list of (quote_id, row) with row None for a deleted quote. When there are more
+    than CHANGE_POLL_LIMIT entries, added and changed are None: a full reload is cheaper.
+    """
+    if since is None:
+        return current_change_version(), [], []
+    log = fetch_rows("SELECT id, quote_id, action FROM quote_changes WHERE id > %s ORDER BY id LIMIT %s",
+                     (since, CHANGE_POLL_LIMIT + 1))
+    if not log:
+        return since, [], []
+    if len(log) > CHANGE_POLL_LIMIT:
+        return current_change_version(), None, None
+    inserted, touched = set(), {}
+    for _, quote_id, action in log:
+        if action == "insert":
+            inserted.add(quote_id)
+        touched[quote_id] = action
+    rows = get_quotes_by_ids([quote_id for quote_id, action in touched.items() if action != "delete"])
+    # A quote inserted and deleted again between two polls was never shown, so it is skipped.
+    added = [(quote_id, rows[quote_id]) for quote_id in touched if quote_id in inserted and quote_id in rows]
+    changed = [(quote_id, rows.get(quote_id)) for quote_id in touched if quote_id not in inserted]
+    return log[-1][0], added, changed
+
+
+def known_row(quote_id):
+    """The row this client last saw for a quote, or None if it has none."""
+    if _quote_model is not None:
+        return _quote_model.get(quote_id)
+    cached = _quote_cache.peek(quote_id)
+    return (quote_id,) + cached if cached is not None else None
+
+
+def apply_changes(tree, added, changed):
+    """
+    Apply changes made by other clients (on the Tk thread): update the client-side
+    copies, adjust the cached facet counts and patch just those rows in the view.
+    This client's own writes, already applied when they were made, are skipped.
+    """
+    def remote(changes):
+        kept = []
+        for quote_id, row in changes:
+            row = tuple(row) if row is not None else None
+            if _local_changes.pop(quote_id, "unseen") != row:
+                kept.append((quote_id, row))
+        return kept
+
+    added, changed = remote(added), remote(changed)
+    if not added and not changed:
+        return
+    facet_changes = [(None, row) for _, row in added]
+    for quote_id, row in changed:
+        old_row = known_row(quote_id)
+        if old_row is None:
+            facet_changes = None  # The old author and category are unknown; re-read the counts
+        elif facet_changes is not None:
+            facet_changes.append((old_row, row))
+    for quote_id, row in added + changed:
+        quote_written(quote_id, row, local=False)
+    quotes_changed(facet_changes)
+    if added:
+        patch_quotes(tree, added, added=True)
+    if changed:
+        patch_quotes(tree, changed)
+    if app_status_label:
+        app_status_label.config(text=f"{len(added) + len(changed)} quotes changed by other users")
+
+
+def reload_all_quotes(tree):
+    """Drop every client-side copy and reload the list, after more changes than are worth replaying."""
+    reset_quote_model()
+    reset_search_index()
+    reset_duplicate_index()
+    _quote_cache.invalidate()
+    _local_changes.clear()
+    quotes_changed()
+    load_quotes(tree)
+
+
+class ChangePoller:
+    """Polls the change log every CHANGE_POLL_MS and applies other clients' changes to the main window."""
+
+    def __init__(self, root, tree, interval=CHANGE_POLL_MS):
+        self.root = root
+        self.tree = tree
+        self.interval = interval
+        self.version = None  # Read on the first poll
+
+    def start(self):
+        self._poll()
+
+    def _poll(self):
+        run_in_background(fetch_changes, self.version, on_done=self._polled, on_error=self._failed,
+                          key="changes", description=None)
+
+    def _polled(self, result):
+        version, added, changed = result
+        first = self.version is None
+        self.version = version
+        if added is None:
+            reload_all_quotes(self.tree)
+        elif not first:
+            apply_changes(self.tree, added, changed)
+        self._schedule()
+
+    def _failed(self, error):
+        self._schedule()  # e.g. the server went away; the list keeps working from memory
+
+    def _schedule(self):
+        if self.root.winfo_exists():
+            self.root.after(self.interval, self._poll)
+
+
+def start_change_poller(root, tree):
+    global _change_poller
+    if CHANGE_POLL_MS and not app_offline:
+        _change_poller = ChangePoller(root, tree)
+        _change_poller.start()
+    return _change_poller
+
+
+# ------------------------------------------------------------------------------
+# Quote Cache
+# ------------------------------------------------------------------------------
+class QuoteCache:
+    """
+    An LRU map of quote id -> (quote_text, author, category), filled from every result
+    set the app fetches so opening a quote that is already listed needs no query.
+    Writes invalidate their row; `generation` lets a fetch that started before a write
+    skip caching rows that may already be stale.
+    """
+
+    def __init__(self, max_size=QUOTE_CACHE_SIZE):
+        self.max_size = max_size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, quote_id):
+        with self._lock:
+            quote = self._rows.get(int(quote_id))
+            if quote is None:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(int(quote_id))
+            self.hits += 1
+            return quote
+
+    def peek(self, quote_id):
+        """The cached quote or None, for internal lookups: no hit/miss counting, no LRU bump."""
+        with self._lock:
+            return self._rows.get(int(quote_id))
+
+    def put_many(self, rows, generation):
+        """Cache (id, quote_text, author, category) rows fetched at `generation`."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            for row in rows:
+                self._rows[row[0]] = tuple(row[1:])
+                self._rows.move_to_end(row[0])
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, quote_id=None):
+        """Drop one quote, or every quote when quote_id is None."""
+        with self._lock:
+            self.generation += 1
+            if quote_id is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(int(quote_id), None)
+
+    def get_stats(self):
+        """Return a snapshot of the cache counters for the status bar and diagnostics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self._rows), "max_size": self.max_size, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+_quote_cache = QuoteCache()
+
+
+# ------------------------------------------------------------------------------
+# Quote Model
+# ------------------------------------------------------------------------------
+class StringTable:
+    """Interns author or category names as small integer codes."""
+    __slots__ = ("names", "codes")
+
+    def __init__(self):
+        self.names = []   # code -> name
+        self.codes = {}   # name -> code
+
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return code
+
+    def matching(self, name):
+        """Codes of every spelling of a name, compared case-insensitively like the database."""
+        name = name.lower()
+        return [code for candidate, code in self.codes.items() if candidate.lower() == name]
+
+    def ranks(self):
+        """Code -> position of its name in case-insensitive order; spellings of one name share a rank."""
+        ranks = [0] * len(self.names)
+        rank, previous = -1, None
+        for code in sorted(range(len(self.names)), key=lambda code: self.names[code].lower()):
+            if self.names[code].lower() != previous:
+                rank, previous = rank + 1, self.names[code].lower()
+            ranks[code] = rank
+        return ranks
+
+
+def sort_positions(model, positions, sort_keys):
+    """Reorder model positions (in id order) by sort keys, using the model's per-row collation keys."""
+    with timed("sort.model"):
+        order = list(positions)
+        for column, descending in reversed(sort_keys):
+            order.sort(key=model.collation_keys(column).__getitem__, reverse=descending)
+        return array("l", order)
+
+
+def code_positions(codes, table, value):
+    """Indexes in a code column of every spelling of `value`, in order."""
+    positions = array("l")
+    matching = table.matching(value)
+    for code in matching:
+        # array.index scans in C, so each step jumps straight to the next match.
+        index = -1
+        try:
+            while True:
+                index = codes.index(code, index + 1)
+                positions.append(index)
+        except ValueError:
+            pass
+    return array("l", sorted(positions)) if len(matching) > 1 else positions
+
+
+def code_counts(codes, table):
+    """(name, count) pairs of a code column, sorted by name like get_facet_counts()."""
+    counts = Counter(codes)
+    return sorted((table.names[code], count) for code, count in counts.items())
+
+
+class QuoteModel:
+    """
+    The client-side copy of the quotes table, stored by column: ids in a sorted array,
+    author and category as interned integer codes, and the quote texts in a list. Rows
+    are only built as tuples for the handful the view shows, and filtering by author or
+    category compares integer codes instead of strings. Kept up to date by
+    add_quote/update_quote/delete_quote, like the search index.
+    """
+    __slots__ = ("ids", "texts", "author_codes", "category_codes", "authors", "categories",
+                 "generation", "text_bytes", "watermark", "_collation", "_lock")
+
+    def __init__(self):
+        self.ids = array("l")
+        self.texts = []
+        self.author_codes = array("I")
+        self.category_codes = array("I")
+        self.authors = StringTable()
+        self.categories = StringTable()
+        self.generation = 0   # Bumped on every change so queries know their positions are stale
+        self.text_bytes = 0
+        self.watermark = ""   # updated_at of the newest change the model includes
+        self._collation = {}  # list column -> (generation, per-row sort keys)
+        self._lock = threading.RLock()
+
+    def build(self):
+        """Load every quote in the database, streaming rows in id order."""
+        self.watermark = current_watermark()
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT {QUOTE_COLUMNS} FROM quotes ORDER BY quotes.id")
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                for quote_id, quote_text, author, category in rows:
+                    self.ids.append(quote_id)
+                    self.texts.append(quote_text)
+                    self.author_codes.append(self.authors.code(author))
+                    self.category_codes.append(self.categories.code(category))
+                    self.text_bytes += sys.getsizeof(quote_text)
+        finally:
+            cursor.close()
+            conn.close()
+        return self
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _index(self, quote_id):
+        index = bisect_left(self.ids, quote_id)
+        return index if index < len(self.ids) and self.ids[index] == quote_id else None
+
+    def row(self, index):
+        return (self.ids[index], self.texts[index], self.authors.names[self.author_codes[index]],
+                self.categories.names[self.category_codes[index]])
+
+    def get(self, quote_id):
+        """The (id, quote_text, author, category) row of a quote, or None."""
+        with self._lock:
+            index = self._index(int(quote_id))
+            return None if index is None else self.row(index)
+
+    def put(self, row):
+        """Add a quote or replace its previous version."""
+        quote_id, quote_text, author, category = row
+        with self._lock:
+            index = self._index(quote_id)
+            if index is None:
+                index = bisect_left(self.ids, quote_id)
+                self.ids.insert(index, quote_id)
+                self.texts.insert(index, quote_text)
+                self.author_codes.insert(index, self.authors.code(author))
+                self.category_codes.insert(index, self.categories.code(category))
+            else:
+                self.text_bytes -= sys.getsizeof(self.texts[index])
+                self.texts[index] = quote_text
+                self.author_codes[index] = self.authors.code(author)
+                self.category_codes[index] = self.categories.code(category)
+            self.text_bytes += sys.getsizeof(quote_text)
+            self.generation += 1
+
+    def remove(self, quote_id):
+        with self._lock:
+            index = self._index(quote_id)
+            if index is None:
+                return
+            self.text_bytes -= sys.getsizeof(self.texts[index])
+            del self.ids[index], self.texts[index], self.author_codes[index], self.category_codes[index]
+            self.generation += 1
+
+    def _column(self, column):
+        return (self.author_codes, self.authors) if column == "author" else (self.category_codes, self.categories)
+
+    def positions(self, column, value):
+        """Indexes of the quotes whose author or category is `value`, in id order."""
+        with self._lock:
+            return code_positions(*self._column(column), value)
+
+    def facet_counts(self, column):
+        with self._lock:
+            return code_counts(*self._column(column))
+
+    def collation_keys(self, column):
+        """
+        A sort key per row for a list column, computed once and kept until the model
+        changes: ids, lower-cased texts, or the rank of each author or category name.
+        """
+        cached = self._collation.get(column)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        if column == "ID":
+            keys = self.ids
+        elif column == "Quote":
+            keys = [text.lower() for text in self.texts]
+        else:
+            codes, table = self._column(column.lower())
+            keys = array("l", map(table.ranks().__getitem__, codes))
+        self._collation[column] = (self.generation, keys)
+        return keys
+
+    def get_stats(self):
+        """Quote and name counts and the approximate memory held, for the diagnostics window."""
+        with self._lock:
+            columns = sum(column.buffer_info()[1] * column.itemsize
+                          for column in (self.ids, self.author_codes, self.category_codes))
+            names = sum(sys.getsizeof(name) for name in self.authors.names + self.categories.names)
+            total = columns + sys.getsizeof(self.texts) + self.text_bytes + names
+            return {"quotes": len(self.ids), "authors": len(self.authors.names),
+                    "categories": len(self.categories.names), "bytes": total,
+                    "bytes_per_quote": round(total / len(self.ids)) if self.ids else 0}
+
+
+class ModelQuery:
+    """
+    A QuoteQuery-compatible view of the quote model (or its snapshot): all quotes, or
+    those by one author or in one category, in id order or sorted by `sort_keys`. The
+    matching positions are found by comparing integer codes and kept until the model
+    changes.
+    """
+
+    def __init__(self, model, column=None, value=None, sort_keys=()):
+        if column == "search" and not tokenize(value):
+            column = value = None  # Nothing to search for: the unfiltered view, like the LIKE fallback online
+        self.model = model
+        self.column = column
+        self.value = value
+        self.sort_keys = sort_keys
+        self.order_by = sort_order_sql(sort_keys) if sort_keys else "id"
+        self._positions = None
+        self._generation = None
+
+    def matches(self, row):
+        if self.column is None:
+            return True
+        if self.column == "search":
+            return matches_terms(row, tokenize(self.value))
+        return row[2 if self.column == "author" else 3].lower() == self.value.lower()
+
+    def _load(self):
+        """Matching positions in the model, in order, or None for every quote in id order."""
+        if self.column is None and not self.sort_keys:
+            return None
+        if self._generation != self.model.generation:
+            self._generation = self.model.generation
+            if self.column is None:
+                positions = range(len(self.model))
+            elif self.column == "search":
+                # Only used offline, when neither the server nor the search index can answer.
+                terms = tokenize(self.value)
+                positions = array("l", (index for index in range(len(self.model))
+                                        if matches_terms(self.model.row(index), terms)))
+            else:
+                positions = self.model.positions(self.column, self.value)
+            if self.sort_keys:
+                positions = sort_positions(self.model, positions, self.sort_keys)
+            self._positions = positions
+        return self._positions
+
+    def count(self):
+        with self.model._lock:
+            positions = self._load()
+            return len(self.model) if positions is None else len(positions)
+
+    def fetch(self, offset=0, limit=None):
+        with self.model._lock:
+            positions = self._load()
+            total = len(self.model) if positions is None else len(positions)
+            end = total if limit is None else min(total, offset + limit)
+            indexes = range(offset, end) if positions is None else positions[offset:end]
+            return [self.model.row(index) for index in indexes]
+
+
+_quote_model = None  # Built in the background after the first page of the main list is shown
+_quote_model_lock = threading.Lock()
+
+
+def model_query(column=None, value=None):
+    """A ModelQuery on the quote model, or None while the model isn't loaded."""
+    model = _quote_model
+    return ModelQuery(model, column, value) if model is not None else None
+
+
+def build_quote_model():
+    """
+    Load the quote model from the database. Writes made while it was loading are then
+    replayed from the change log; writes after that reach it through quote_written().
+    """
+    global _quote_model
+    version = current_change_version()
+    model = QuoteModel().build()
+    with _quote_model_lock:
+        _quote_model = model
+    _, added, changed = fetch_changes(version)
+    if added is None:
+        reset_quote_model()  # Too much changed while loading; try again on the next reload
+        return None
+    for quote_id, row in added + changed:
+        if row is not None:
+            model.put(tuple(row))
+        else:
+            model.remove(quote_id)
+    return model
+
+
+def start_quote_model(total):
+    """Build the quote model in the background once the main list knows the table size, then save it."""
+    if CLIENT_MODEL and _quote_model is None and total <= CLIENT_MODEL_MAX_QUOTES:
+        run_in_background(build_quote_model, key="quote-model", description="Loading quotes into memory...",
+                          on_done=lambda model: run_in_background(save_snapshot, model,
+                                                                  description="Saving local copy..."))
+
+
+def reset_quote_model():
+    """Drop the quote model after bulk changes; it is rebuilt when the list next loads."""
+    global _quote_model
+    with _quote_model_lock:
+        _quote_model = None
+
+
+# ------------------------------------------------------------------------------
+# Local Snapshot
+# ------------------------------------------------------------------------------
+# The quote model is saved to a binary file on local disk so the next launch can show
+# the list before the database answers, and keep browsing read-only if it never does.
+# Layout, in native byte order after a fixed header: ids (int64), text offsets and
+# name offsets (uint64, one more than there are entries), author and category codes
+# (uint32), then a heap of UTF-8 quote texts followed by the author and category names.
+
+SNAPSHOT_MAGIC  = b"QKSNAP"
+SNAPSHOT_HEADER = struct.Struct("<6sHIIIQ32s4x")  # magic, format, quotes, authors, categories, heap size, watermark
+
+
+def snapshot_path():
+    """The snapshot file of the configured database, one per backend and database."""
+    if get_backend().name == "sqlite":
+        identity = f"sqlite:{os.path.abspath(SQLITE_PATH)}"
+    else:
+        identity = f"mysql:{DB_USER}@{DB_HOST}/{DB_NAME}"
+    digest = hashlib.blake2b(identity.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"quotes_{digest}.snapshot")
+
+
+def current_watermark():
+    """The newest quotes.updated_at on the server, as text: the version a model is current to."""
+    value = fetch_rows("SELECT MAX(updated_at) FROM quotes")[0][0]
+    return "" if value is None else str(value)
+
+
+def write_snapshot(model, path=None):
+    """Save a QuoteModel atomically (write a temporary file, then rename it over the old one)."""
+    path = path or snapshot_path()
+    with model._lock:
+        texts = [text.encode("utf-8") for text in model.texts]
+        names = [name.encode("utf-8") for name in model.authors.names + model.categories.names]
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(texts), len(model.authors.names),
+                                      len(model.categories.names), sum(map(len, texts)) + sum(map(len, names)),
+                                      model.watermark.encode("ascii"))
+        columns = [array("q", model.ids),
+                   array("Q", itertools.accumulate(map(len, texts), initial=0)),
+                   array("Q", itertools.accumulate(map(len, names), initial=sum(map(len, texts)))),
+                   model.author_codes, model.category_codes]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(header)
+            for column in columns:
+                column.tofile(file)
+            file.writelines(texts)
+            file.writelines(names)
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return path
+
+
+class QuoteSnapshot:
+    """
+    A snapshot file opened with mmap. The id, code and offset columns are memoryviews
+    onto the mapped pages and a quote's text is decoded only when its row is shown, so
+    opening costs the same for ten quotes or a million. Serves the views in place of a
+    QuoteModel, read-only, until reconcile_snapshot() has replaced it with a live one.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = [memoryview(self._mmap)]
+        try:
+            magic, version, count, authors, categories, heap_size, watermark = \
+                SNAPSHOT_HEADER.unpack_from(self._mmap)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT:
+                raise ValueError(f"not a format {SNAPSHOT_FORMAT} snapshot")
+            self._offset = SNAPSHOT_HEADER.size
+            self.ids = self._column("q", count)
+            self.text_offsets = self._column("Q", count + 1)
+            name_offsets = self._column("Q", authors + categories + 1)
+            self.author_codes = self._column("I", count)
+            self.category_codes = self._column("I", count)
+            self.heap = self._column("B", heap_size)
+            self.watermark = watermark.rstrip(b"\0").decode("ascii")
+            self.authors, self.categories = StringTable(), StringTable()
+            for index in range(authors + categories):
+                table = self.authors if index < authors else self.categories
+                table.code(str(self.heap[name_offsets[index]:name_offsets[index + 1]], "utf-8"))
+        except (ValueError, TypeError, IndexError, struct.error) as err:
+            self.close()
+            raise ValueError(f"Unreadable quote snapshot {path}: {err}") from None
+        except BaseException:
+            self.close()
+            raise
+        self.generation = 0
+        self.pending = []         # Writes made while the snapshot is being reconciled
+        self.successor = None     # The live model that took over, once reconciled
+        self._code_arrays = {}
+        self._collation = {}
+        self._lock = threading.RLock()
+
+    def _column(self, typecode, length):
+        size = struct.calcsize(typecode) * length
+        if self._offset + size > len(self._mmap):
+            raise ValueError("Quote snapshot is truncated")
+        view = self._views[0][self._offset:self._offset + size].cast(typecode)
+        self._views.append(view)
+        self._offset += size
+        return view
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._mmap.close()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, index):
+        start, end = self.text_offsets[index], self.text_offsets[index + 1]
+        return (self.ids[index], str(self.heap[start:end], "utf-8"), self.authors.names[self.author_codes[index]],
+                self.categories.names[self.category_codes[index]])
+
+    def get(self, quote_id):
+        index = bisect_left(self.ids, int(quote_id))
+        return self.row(index) if index < len(self.ids) and self.ids[index] == int(quote_id) else None
+
+    def _codes(self, column):
+        # array.index needs an array; copying the mapped codes is a single memcpy.
+        codes = self._code_arrays.get(column)
+        if codes is None:
+            codes = self._code_arrays[column] = array("I")
+            codes.frombytes((self.author_codes if column == "author" else self.category_codes).cast("B"))
+        return codes
+
+    def positions(self, column, value):
+        with self._lock:
+            table = self.authors if column == "author" else self.categories
+            return code_positions(self._codes(column), table, value)
+
+    def facet_counts(self, column):
+        with self._lock:
+            return code_counts(self._codes(column), self.authors if column == "author" else self.categories)
+
+    def collation_keys(self, column):
+        keys = self._collation.get(column)
+        if keys is None:
+            if column == "ID":
+                keys = self.ids
+            elif column == "Quote":
+                offsets, heap = self.text_offsets, self.heap
+                keys = [str(heap[offsets[index]:offsets[index + 1]], "utf-8").lower() for index in range(len(self))]
+            else:
+                table = self.authors if column == "Author" else self.categories
+                keys = array("l", map(table.ranks().__getitem__, self._codes(column.lower())))
+            self._collation[column] = keys
+        return keys
+
+    def put(self, row):
+        """Writes while reconciling are replayed onto the live model once it is ready."""
+        with self._lock:
+            if self.successor is not None:
+                self.successor.put(row)
+            else:
+                self.pending.append(("put", row))
+
+    def remove(self, quote_id):
+        with self._lock:
+            if self.successor is not None:
+                self.successor.remove(quote_id)
+            else:
+                self.pending.append(("remove", quote_id))
+
+    def to_model(self):
+        """A live QuoteModel with the snapshot's contents, its quote texts decoded."""
+        model = QuoteModel()
+        model.ids.extend(self.ids)
+        model.author_codes.frombytes(self.author_codes.cast("B"))
+        model.category_codes.frombytes(self.category_codes.cast("B"))
+        model.authors, model.categories = self.authors, self.categories
+        offsets, heap = self.text_offsets, self.heap
+        model.texts = [str(heap[offsets[index]:offsets[index + 1]], "utf-8") for index in range(len(self.ids))]
+        model.text_bytes = sum(map(sys.getsizeof, model.texts))
+        model.watermark = self.watermark
+        return model
+
+    def get_stats(self):
+        return {"quotes": len(self.ids), "authors": len(self.authors.names),
+                "categories": len(self.categories.names), "snapshot_bytes": len(self._mmap),
+                "watermark": self.watermark}
+
+
+def open_snapshot():
+    """The configured database's snapshot, or None when there is none or it can't be read."""
+    try:
+        return QuoteSnapshot(snapshot_path())
+    except (OSError, ValueError):
+        return None
+
+
+def reconcile_snapshot(snapshot):
+    """
+    Bring a snapshot up to date as a live QuoteModel: drop the quotes the change log
+    records as deleted since its watermark, then fetch only the rows changed since it.
+    If the log was pruned past the watermark, every id on the server is read instead.
+    Runs in the background; raises when the database can't be reached.
+    Returns (model, changed, removed).
+    """
+    watermark = current_watermark()
+    model = snapshot.to_model()
+    removed = []
+    changed = 0
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT changed_at FROM quote_changes ORDER BY id LIMIT 1")
+        oldest = cursor.fetchone()
+        if oldest is not None and str(oldest[0]) <= snapshot.watermark:
+            cursor.execute("SELECT DISTINCT quote_id FROM quote_changes WHERE action = 'delete' AND changed_at >= %s",
+                           (snapshot.watermark,))
+            removed = [quote_id for quote_id, in cursor.fetchall() if model.get(quote_id) is not None]
+        else:
+            live_ids = array("l")
+            cursor.execute("SELECT id FROM quotes ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                live_ids.extend(row[0] for row in rows)
+            for quote_id in model.ids:
+                index = bisect_left(live_ids, quote_id)
+                if index == len(live_ids) or live_ids[index] != quote_id:
+                    removed.append(quote_id)
+        for quote_id in removed:
+            model.remove(quote_id)
+        # Rows are put after the removals, so an id deleted and then used again is kept.
+        cursor.execute(f"SELECT {QUOTE_COLUMNS} FROM quotes WHERE updated_at >= %s", (snapshot.watermark,))
+        while True:
+            rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                model.put(row)
+            changed += len(rows)
+    finally:
+        cursor.close()
+        conn.close()
+    model.watermark = watermark
+    return model, changed, len(removed)
+
+
+def install_reconciled_model(snapshot, model):
+    """
+    Swap a reconciled model in for its snapshot (on the Tk thread): replay the writes
+    made meanwhile, point the main list at the model and save a fresh snapshot.
+    """
+    global _quote_model
+    with snapshot._lock:
+        for action, value in snapshot.pending:
+            if action == "put":
+                model.put(value)
+            else:
+                model.remove(value)
+        snapshot.pending.clear()
+        snapshot.successor = model
+        with _quote_model_lock:
+            if _quote_model is snapshot:
+                _quote_model = model
+    if app_tree:
+        virtual_list = get_virtual_list(app_tree)
+        query = virtual_list.query if virtual_list else getattr(app_tree, "quote_query", None)
+        if isinstance(query, ModelQuery) and query.model is snapshot:
+            query.model = model
+            if virtual_list:
+                virtual_list.refresh()
+            else:
+                show_quotes(app_tree, query)
+    if _quote_model is model:
+        run_in_background(save_snapshot, model, description="Saving local copy...")
+
+
+def save_snapshot(model=None):
+    """Save the live quote model, if there is one, as the configured database's snapshot."""
+    model = model or _quote_model
+    if not SNAPSHOT or not isinstance(model, QuoteModel):
+        return None
+    try:
+        return write_snapshot(model)
+    except OSError:
+        return None  # e.g. a read-only home directory; the next launch loads from the database
+
+
+def require_online():
+    """Writes are refused while browsing the local snapshot offline. Returns True when online."""
+    if app_offline:
+        messagebox.showinfo("Offline", "The database can't be reached, so the local copy is read-only.")
+    return not app_offline
+
+
+def open_local_snapshot():
+    """
+    Show the list from the local snapshot, if there is one, while it is reconciled with
+    the database in the background. Returns True when the snapshot was opened.
+    """
+    global _quote_model
+    if not (SNAPSHOT and CLIENT_MODEL) or _quote_model is not None:
+        return False
+    snapshot = open_snapshot()
+    if snapshot is None:
+        return False
+    _quote_model = snapshot
+
+    def reconciled(result):
+        model, changed, removed = result
+        install_reconciled_model(snapshot, model)
+        if app_status_label:
+            app_status_label.config(text=f"Local copy updated: {changed} changed, {removed} removed")
+
+    def unreachable(error):
+        if app_status_label:
+            app_status_label.config(text=f"Offline - showing the local copy as of {snapshot.watermark or 'unknown'}")
+
+    run_in_background(reconcile_snapshot, snapshot, on_done=reconciled, on_error=unreachable, key="quote-model",
+                      description="Checking for changes...")
+    return True
+
+
+# ------------------------------------------------------------------------------
+# Full-Text Search
+# ------------------------------------------------------------------------------
+FULLTEXT_INDEX   = "ft_quotes"
+FULLTEXT_COLUMNS = "quote_text, author, category"
+_fulltext_available = None  # unknown until the first search asks the backend
+_search_index = None
+_search_index_lock = threading.Lock()
+
+
+def ensure_fulltext_index(cursor):
+    """Create the FULLTEXT index used by search_quotes() if it is missing. Returns True when available."""
+    global _fulltext_available
+    exists = get_backend().has_fulltext(cursor)
+    if not exists:
+        try:
+            cursor.execute(f"ALTER TABLE quotes ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({FULLTEXT_COLUMNS})")
+            exists = True
+        except DB_ERRORS:
+            exists = False  # e.g. an old storage engine; search falls back to the local index
+    _fulltext_available = exists
+    return exists
+
+
+def ensure_fts5_table(cursor):
+    """Create the SQLite FTS5 table and the triggers keeping it in sync. Returns True when available."""
+    global _fulltext_available
+    exists = get_backend().has_fulltext(cursor)
+    if not exists:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE quotes_fts USING fts5("
+                           "quote_text, author, category, content='quotes', content_rowid='id')")
+        except sqlite3.Error:
+            _fulltext_available = False  # SQLite built without FTS5; search falls back to the local index
+            return False
+        cursor.execute("INSERT INTO quotes_fts(quotes_fts) VALUES ('rebuild')")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS quotes_fts_insert AFTER INSERT ON quotes BEGIN
+            INSERT INTO quotes_fts(rowid, quote_text, author, category)
+            VALUES (new.id, new.quote_text, new.author, new.category);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS quotes_fts_delete AFTER DELETE ON quotes BEGIN
+            INSERT INTO quotes_fts(quotes_fts, rowid, quote_text, author, category)
+            VALUES ('delete', old.id, old.quote_text, old.author, old.category);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS quotes_fts_update AFTER UPDATE OF quote_text, author, category ON quotes BEGIN
+            INSERT INTO quotes_fts(quotes_fts, rowid, quote_text, author, category)
+            VALUES ('delete', old.id, old.quote_text, old.author, old.category);
+            INSERT INTO quotes_fts(rowid, quote_text, author, category)
+            VALUES (new.id, new.quote_text, new.author, new.category);
+        END
+    """)
+    _fulltext_available = True
+    return True
+
+
+def fulltext_available():
+    """Whether the backend's full-text index exists; looked up once, on the first search."""
+    global _fulltext_available
+    if _fulltext_available is None:
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            _fulltext_available = get_backend().has_fulltext(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+    return _fulltext_available
+
 
-# --- Unique fonts for specialized windows ---
-# For the Categories window:
-CATEGORIES_HEADER_FONT = ("Helvetica", 22, "bold italic")
-CATEGORIES_ITEM_FONT   = ("Verdana", 14, "italic")
-CATEGORIES_SUBTITLE_FONT = ("Verdana", 12, "bold")
-# For the Authors window:
-AUTHORS_HEADER_FONT  = ("Helvetica", 22, "bold italic")
-AUTHORS_ITEM_FONT    = ("Verdana", 14, "italic")
-AUTHORS_SUBTITLE_FONT = ("Verdana", 12, "bold")
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return re.findall(r"\w+", text.lower())
 
-# Global references (used later for the main app)
-app_root = None
-app_tree = None
-app_status_label = None
-app_quote_count_label = None
+
+class SearchIndex:
+    """
+    In-memory inverted index over quote text, author and category.
+    Each token maps to a sorted array of quote ids in which an id appears once per
+    occurrence, so term frequency is the width of its run. The index is kept up to
+    date by add_quote/update_quote/delete_quote instead of being rebuilt.
+    """
+
+    def __init__(self):
+        self.postings = {}      # token -> array of quote ids, sorted
+        self.doc_tokens = {}    # quote id -> tuple of its tokens
+        self._vocabulary = []   # Sorted tokens for prefix lookups, rebuilt lazily
+        self._vocabulary_dirty = False
+        self._results = OrderedDict()  # Ranked id lists of recent queries
+        self._lock = threading.RLock()
+
+    def build(self):
+        """Index every quote in the database, streaming rows in pages."""
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT id, quote_text, author, category FROM quotes ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(PAGE_SIZE * 10)
+                if not rows:
+                    break
+                for row in rows:
+                    self.add(*row)
+        finally:
+            cursor.close()
+            conn.close()
+        return self
+
+    def add(self, quote_id, quote_text, author, category):
+        """Index a quote, replacing any previous version of it."""
+        tokens = tuple(sys.intern(token) for token in tokenize(f"{quote_text} {author} {category}"))
+        with self._lock:
+            self.remove(quote_id)
+            self.doc_tokens[quote_id] = tokens
+            for token in tokens:
+                posting = self.postings.get(token)
+                if posting is None:
+                    self.postings[token] = array("l", [quote_id])
+                    self._vocabulary_dirty = True
+                elif posting[-1] <= quote_id:
+                    posting.append(quote_id)
+                else:
+                    insort(posting, quote_id)
+            self._results.clear()
+
+    def remove(self, quote_id):
+        with self._lock:
+            tokens = self.doc_tokens.pop(quote_id, None)
+            if tokens is None:
+                return
+            for token in set(tokens):
+                posting = self.postings[token]
+                del posting[bisect_left(posting, quote_id):bisect_right(posting, quote_id)]
+                if not posting:
+                    del self.postings[token]
+                    self._vocabulary_dirty = True
+            self._results.clear()
+
+    def _expand(self, term, prefix):
+        """Index tokens a query term matches: itself, or every token it prefixes."""
+        if not prefix:
+            return [term] if term in self.postings else []
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def _rank(self, query):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        postings_per_term = []
+        for i, term in enumerate(terms):
+            tokens = self._expand(term, prefix=(i == len(terms) - 1))
+            if not tokens:
+                return []
+            postings = [self.postings[token] for token in tokens]
+            if len(postings) > SEARCH_PREFIX_MERGE:
+                # A short prefix can match thousands of tokens; their union is scored as one term.
+                postings = [array("l", sorted(itertools.chain.from_iterable(postings)))]
+            postings_per_term.append(postings)
+        # Score the rarest term's postings directly, then check the candidates
+        # against the remaining terms by bisection.
+        postings_per_term.sort(key=lambda postings: sum(len(p) for p in postings))
+        total_docs = len(self.doc_tokens)
+        scores = {}
+        for posting in postings_per_term[0]:
+            weight = math.log(1 + total_docs / len(posting))
+            for quote_id in posting:
+                scores[quote_id] = scores.get(quote_id, 0.0) + weight
+        for postings in postings_per_term[1:]:
+            idf = [math.log(1 + total_docs / len(p)) for p in postings]
+            for quote_id in list(scores):
+                score = 0.0
+                for posting, weight in zip(postings, idf):
+                    start = bisect_left(posting, quote_id)
+                    if start < len(posting) and posting[start] == quote_id:
+                        score += weight * (bisect_right(posting, quote_id, start) - start)
+                if score:
+                    scores[quote_id] += score
+                else:
+                    del scores[quote_id]
+        # tf-idf normalised by quote length; ties broken by id.
+        return sorted(scores, key=lambda q: (-scores[q] / math.sqrt(len(self.doc_tokens[q])), q))
+
+    def search(self, query, offset=0, limit=None):
+        """Return (total, ids) for one page of ranked matches for a query."""
+        with self._lock:
+            ranked = self._results.get(query)
+            if ranked is None:
+                ranked = self._rank(query)
+                self._results[query] = ranked
+                if len(self._results) > SEARCH_CACHED_QUERIES:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(query)
+        end = len(ranked) if limit is None else offset + limit
+        return len(ranked), ranked[offset:end]
+
+
+def get_search_index():
+    """Returns the local search index, building it from the database on first use."""
+    global _search_index
+    with _search_index_lock:
+        if _search_index is None:
+            _search_index = SearchIndex().build()
+        return _search_index
+
+
+def reset_search_index():
+    """Drop the local search index after bulk changes; it is rebuilt on next use."""
+    global _search_index
+    with _search_index_lock:
+        _search_index = None
+
+
+class LocalSearchQuery:
+    """A QuoteQuery-compatible view of ranked results from the local SearchIndex."""
+    order_by = "rank"
+
+    def __init__(self, query):
+        self.query = query
+
+    def matches(self, row):
+        return matches_terms(row, tokenize(self.query))
+
+    def count(self):
+        return get_search_index().search(self.query, 0, 0)[0]
+
+    def fetch(self, offset=0, limit=None):
+        ids = get_search_index().search(self.query, offset, limit)[1]
+        if not ids:
+            return []
+        generation = _quote_cache.generation
+        rows = get_quotes_by_ids(ids)
+        _quote_cache.put_many(rows.values(), generation)
+        return [rows[quote_id] for quote_id in ids if quote_id in rows]
 
 
 # ------------------------------------------------------------------------------
-# Database Connection & Initialization Functions
+# Duplicate Detection
 # ------------------------------------------------------------------------------
-def get_connection():
-    """Returns a connection to the MySQL database 'quotes_keeper'."""
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",  # Default XAMPP password; change if needed.
-        database="quotes_keeper"
-    )
+MINHASH_PRIME = (1 << 31) - 1
+_minhash_random = random.Random(DEDUP_SEED)
+_MINHASH_PARAMS = [(_minhash_random.randrange(1, MINHASH_PRIME), _minhash_random.randrange(MINHASH_PRIME))
+                   for _ in range(DEDUP_PERMUTATIONS)]
+DEDUP_ROWS_PER_BAND = DEDUP_PERMUTATIONS // DEDUP_BANDS
+_PUNCTUATION_RE = re.compile(r"[^\w\s]|_")
+_duplicate_index = None
+_duplicate_index_lock = threading.Lock()
 
 
-def initialize_database():
+def normalize_quote_text(text):
+    """Casefold a quote and strip accents, punctuation and extra whitespace for duplicate checks."""
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    return " ".join(_PUNCTUATION_RE.sub(" ", text).split())
+
+
+def exact_quote_key(normalized):
+    """64-bit fingerprint of a normalized quote; equal keys are exact duplicates."""
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@functools.lru_cache(maxsize=DEDUP_SHINGLE_CACHE)
+def _shingle_hashes(shingle):
+    """A shingle's value under every MinHash permutation; common word pairs stay cached."""
+    h = zlib.crc32(shingle.encode("utf-8"))
+    return array("I", [(a * h + b) % MINHASH_PRIME for a, b in _MINHASH_PARAMS])
+
+
+def minhash_signature(normalized):
+    """MinHash of the quote's word shingles; matching positions estimate Jaccard similarity."""
+    words = normalized.split()
+    size = DEDUP_SHINGLE_WORDS
+    shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return array("I", map(min, zip(*map(_shingle_hashes, shingles))))
+
+
+def lsh_band_keys(signature):
+    """One key per LSH band; quotes sharing any band key are near-duplicate candidates."""
+    rows = DEDUP_ROWS_PER_BAND
+    return [hash((band,) + tuple(signature[band * rows:(band + 1) * rows])) for band in range(DEDUP_BANDS)]
+
+
+def signature_similarity(first, second):
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class DuplicateIndex:
     """
-    Connects to MySQL, creates the database 'quotes_keeper' if it doesn't exist,
-    and then creates the 'users' and 'quotes' tables.
+    Exact fingerprints and MinHash signatures of every quote in flat arrays, one position
+    per quote, with the exact keys and each LSH band's keys kept as sorted columns that
+    point back at positions, so a new quote is checked with a few binary searches. It is
+    built in the background after login and kept up to date through quote_written().
     """
-    # First, create the database if not exists.
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password=""
-    )
-    cursor = conn.cursor()
-    cursor.execute("CREATE DATABASE IF NOT EXISTS quotes_keeper")
-    conn.commit()
-    cursor.close()
-    conn.close()
-    # Now, connect to the 'quotes_keeper' database and create tables.
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            username VARCHAR(255) UNIQUE NOT NULL,
-            password VARCHAR(255) NOT NULL
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS quotes (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            quote_text TEXT NOT NULL,
-            author VARCHAR(255) NOT NULL,
-            category VARCHAR(255) NOT NULL
-        )
-    """)
-    conn.commit()
-    cursor.close()
-    conn.close()
 
+    def __init__(self):
+        self.ids = array("q")         # position -> quote id, 0 once the quote is removed
+        self.keys = array("Q")        # position -> exact key
+        self.signatures = array("I")  # DEDUP_PERMUTATIONS values per position
+        # (sorted keys, positions) for the exact keys, then one per LSH band
+        self.columns = [(array("Q"), array("I"))] + [(array("q"), array("I")) for _ in range(DEDUP_BANDS)]
+        self._lock = threading.RLock()
 
-def create_table():
-    # Minimal change: simply ensure database initialization.
-    initialize_database()
+    def build(self):
+        """Index every quote in the database, then sort each key column once."""
+        self.ids, self.keys, self.signatures, bands = read_quote_fingerprints()
+        for (sorted_keys, positions), column in zip(self.columns, [self.keys] + bands):
+            order = sorted(range(len(column)), key=column.__getitem__)
+            positions.extend(order)
+            sorted_keys.extend(map(column.__getitem__, order))
+        return self
 
+    def _signature(self, position):
+        size = DEDUP_PERMUTATIONS
+        return self.signatures[position * size:(position + 1) * size]
 
-def add_quote(quote, author, category, tree):
-    """Insert a new quote into the MySQL database and update the tree view."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO quotes (quote_text, author, category) VALUES (%s, %s, %s)",
-                   (quote, author, category))
-    conn.commit()  # Save changes to the database.
-    cursor.close()
-    conn.close()
-    load_quotes(tree)
-    return True
+    def _position(self, quote_id):
+        try:
+            return self.ids.index(quote_id)
+        except ValueError:
+            return None
 
+    def _unlink(self, position):
+        """Take a position out of every key column."""
+        keys = [self.keys[position]] + lsh_band_keys(self._signature(position))
+        for (sorted_keys, positions), key in zip(self.columns, keys):
+            index = bisect_left(sorted_keys, key)
+            while positions[index] != position:
+                index += 1
+            del sorted_keys[index], positions[index]
 
-def update_quote(quote_id, quote_text, author, category, tree):
-    """Update an existing quote in the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE quotes SET quote_text=%s, author=%s, category=%s WHERE id=%s",
-                   (quote_text, author, category, quote_id))
-    conn.commit()
-    cursor.close()
-    conn.close()
-    load_quotes(tree)
-    return True
+    def add(self, quote_id, quote_text):
+        """Index a quote, replacing any previous version of it in place."""
+        normalized = normalize_quote_text(quote_text)
+        signature = minhash_signature(normalized)
+        keys = [exact_quote_key(normalized)] + lsh_band_keys(signature)
+        size = DEDUP_PERMUTATIONS
+        with self._lock:
+            position = self._position(quote_id)
+            if position is None:
+                position = len(self.ids)
+                self.ids.append(quote_id)
+                self.keys.append(keys[0])
+                self.signatures.extend(signature)
+            else:
+                self._unlink(position)
+                self.keys[position] = keys[0]
+                self.signatures[position * size:(position + 1) * size] = signature
+            for (sorted_keys, positions), key in zip(self.columns, keys):
+                index = bisect_right(sorted_keys, key)
+                sorted_keys.insert(index, key)
+                positions.insert(index, position)
 
+    def remove(self, quote_id):
+        with self._lock:
+            position = self._position(quote_id)
+            if position is not None:
+                self._unlink(position)
+                self.ids[position] = 0
 
-def get_quote_by_id(quote_id):
-    """Retrieve a quote from the database by its ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT quote_text, author, category FROM quotes WHERE id=%s", (quote_id,))
-    result = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return result
+    def check(self, quote_text, exclude=None, threshold=DEDUP_THRESHOLD):
+        """
+        Quotes that duplicate `quote_text`: [(quote_id, similarity, exact)], most similar
+        first. `exclude` skips the quote being edited.
+        """
+        normalized = normalize_quote_text(quote_text)
+        signature = minhash_signature(normalized)
+        keys = [exact_quote_key(normalized)] + lsh_band_keys(signature)
+        matches = {}
+        with self._lock:
+            for column, ((sorted_keys, positions), key) in enumerate(zip(self.columns, keys)):
+                index = bisect_left(sorted_keys, key)
+                while index < len(sorted_keys) and sorted_keys[index] == key:
+                    position = positions[index]
+                    index += 1
+                    quote_id = self.ids[position]
+                    if quote_id in matches:
+                        continue
+                    if column == 0:
+                        matches[quote_id] = (1.0, True)
+                    else:
+                        similarity = signature_similarity(signature, self._signature(position))
+                        if similarity >= threshold:
+                            matches[quote_id] = (similarity, False)
+        matches.pop(exclude, None)
+        return sorted(((quote_id, similarity, exact) for quote_id, (similarity, exact) in matches.items()),
+                      key=lambda match: (-match[1], match[0]))
 
 
-def load_quotes(tree):
-    """Load quotes from the database into the Treeview control."""
-    tree.delete(*tree.get_children())
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM quotes")
-    quotes = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    for quote in quotes:
-        tree.insert("", "end", values=quote)
-    update_quote_count()
+def build_duplicate_index():
+    """
+    Build the duplicate index from the database. As in build_quote_model, writes made
+    while it was building are then replayed from the change log.
+    """
+    global _duplicate_index
+    version = current_change_version()
+    index = DuplicateIndex().build()
+    with _duplicate_index_lock:
+        _duplicate_index = index
+    _, added, changed = fetch_changes(version)
+    if added is None:
+        reset_duplicate_index()  # Too much changed while building; try again on the next reload
+        return None
+    for quote_id, row in added + changed:
+        if row is not None:
+            index.add(quote_id, row[1])
+        else:
+            index.remove(quote_id)
+    return index
 
 
-def delete_quote(tree):
-    """Remove the selected quote from the database."""
-    selected = tree.selection()
-    if not selected:
-        messagebox.showerror("Error", "Please select a quote to delete")
-        return
-    quote_id = tree.item(selected[0])['values'][0]
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM quotes WHERE id=%s", (quote_id,))
-    conn.commit()
-    cursor.close()
-    conn.close()
-    tree.delete(selected[0])
-    messagebox.showinfo("Deleted", "Quote deleted successfully.")
-    update_quote_count()
+def start_duplicate_index():
+    """Build the duplicate index in the background once the main list has loaded."""
+    if DEDUP_CHECK_ON_ADD and _duplicate_index is None and not app_offline:
+        run_in_background(build_duplicate_index, key="duplicate-index",
+                          description="Indexing quotes for duplicate checks...")
 
 
-def get_all_authors():
-    """Get list of all unique authors from the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT author FROM quotes ORDER BY author")
-    authors = [author[0] for author in cursor.fetchall()]
-    cursor.close()
-    conn.close()
-    return authors
+def reset_duplicate_index():
+    """Drop the duplicate index after bulk changes; it is rebuilt when the list next loads."""
+    global _duplicate_index
+    with _duplicate_index_lock:
+        _duplicate_index = None
 
 
-def get_all_categories():
-    """Get list of all unique categories from the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT category FROM quotes ORDER BY category")
-    categories = [category[0] for category in cursor.fetchall()]
-    cursor.close()
-    conn.close()
-    return categories
+def get_quotes_by_ids(quote_ids):
+    """Rows for the given ids, fetched in WHERE id IN (...) chunks, keyed by id."""
+    rows = {}
+    for chunk, placeholders in _id_chunks(list(quote_ids)):
+        rows.update((row[0], row) for row in
+                    fetch_rows(f"SELECT {QUOTE_COLUMNS} FROM quotes WHERE quotes.id IN ({placeholders})", chunk))
+    return rows
 
 
-def filter_quotes_by_author(tree, author):
-    """Filter the quotes in the treeview by a specific author."""
-    tree.delete(*tree.get_children())
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM quotes WHERE author=%s ORDER BY id", (author,))
-    quotes = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    for quote in quotes:
-        tree.insert("", "end", values=quote)
-    update_quote_count()
+def find_duplicates_of(quote_text, exclude=None, limit=5):
+    """
+    The closest existing duplicates of a quote as [(row, similarity, exact)]. While the
+    duplicate index is still building there are none: the check is skipped, not waited for.
+    """
+    index = _duplicate_index
+    if index is None:
+        return []
+    matches = index.check(quote_text, exclude)[:limit]
+    rows = get_quotes_by_ids([quote_id for quote_id, _, _ in matches])
+    return [(rows[quote_id], similarity, exact) for quote_id, similarity, exact in matches if quote_id in rows]
 
 
-def filter_quotes_by_category(tree, category):
-    """Filter the quotes in the treeview by a specific category."""
-    tree.delete(*tree.get_children())
+def read_quote_fingerprints(progress=None):
+    """
+    Fingerprint every quote in the table into flat arrays: (ids, exact keys, signatures
+    with DEDUP_PERMUTATIONS values per quote, one array of keys per LSH band), so memory
+    stays at a few hundred bytes per quote. progress(rows_read) is called per page.
+    """
+    ids, keys, signatures = array("q"), array("Q"), array("I")
+    bands = [array("q") for _ in range(DEDUP_BANDS)]
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM quotes WHERE category=%s ORDER BY id", (category,))
-    quotes = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    for quote in quotes:
-        tree.insert("", "end", values=quote)
-    update_quote_count()
+    try:
+        cursor.execute("SELECT id, quote_text FROM quotes ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            for quote_id, quote_text in rows:
+                normalized = normalize_quote_text(quote_text)
+                signature = minhash_signature(normalized)
+                ids.append(quote_id)
+                keys.append(exact_quote_key(normalized))
+                signatures.extend(signature)
+                for band, band_key in zip(bands, lsh_band_keys(signature)):
+                    band.append(band_key)
+            if progress:
+                progress(len(ids))
+    finally:
+        cursor.close()
+        conn.close()
+    return ids, keys, signatures, bands
 
 
-def update_quote_count():
-    if app_tree and app_quote_count_label:
-        count = len(app_tree.get_children())
-        app_quote_count_label.config(text=f"Total Quotes: {count}")
+def find_duplicate_groups(threshold=DEDUP_THRESHOLD, progress=None):
+    """
+    Group every exact and near-duplicate quote in the table. Candidates are found by
+    sorting each LSH band of the flat fingerprint arrays. Returns groups of
+    {"ids", "exact", "similarity"}, largest first; progress(rows_read) is called per page.
+    """
+    ids, keys, signatures, bands = read_quote_fingerprints(progress)
+    parent = list(range(len(ids)))  # Union-find over row positions
+
+    def find(position):
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def similarity(first, second):
+        size = DEDUP_PERMUTATIONS
+        return signature_similarity(signatures[first * size:(first + 1) * size],
+                                    signatures[second * size:(second + 1) * size])
+
+    exact_positions = set()
+    for column, is_exact in [(keys, True)] + [(band, False) for band in bands]:
+        order = sorted(range(len(ids)), key=column.__getitem__)
+        for _, run in itertools.groupby(order, key=column.__getitem__):
+            run = list(run)
+            # Each member is compared with the first; union-find joins the rest transitively.
+            for position in run[1:]:
+                if is_exact or similarity(run[0], position) >= threshold:
+                    parent[find(position)] = find(run[0])
+                    if is_exact:
+                        exact_positions.update((run[0], position))
+
+    members = {}
+    for position in range(len(ids)):
+        members.setdefault(find(position), []).append(position)
+    groups = []
+    for positions in members.values():
+        if len(positions) < 2:
+            continue
+        exact = all(keys[position] == keys[positions[0]] for position in positions)
+        lowest = 1.0 if exact else min(similarity(positions[0], position) for position in positions[1:])
+        groups.append({"ids": [ids[position] for position in positions], "exact": exact,
+                       "similarity": round(lowest, 3)})
+    groups.sort(key=lambda group: (-len(group["ids"]), group["ids"][0]))
+    return groups
+
+
+def format_duplicate_report(groups, rows, limit=DEDUP_REPORT_GROUPS):
+    """Plain-text report of the largest duplicate groups, with each quote's text and author."""
+    total = sum(len(group["ids"]) - 1 for group in groups)
+    lines = [f"{len(groups)} groups of duplicates, {total} extra copies "
+             f"({sum(group['exact'] for group in groups)} groups are exact).", ""]
+    for group in groups[:limit]:
+        kind = "exact" if group["exact"] else f"near, >= {group['similarity']:.0%} similar"
+        lines.append(f"{len(group['ids'])} quotes ({kind}):")
+        for quote_id in group["ids"]:
+            row = rows.get(quote_id)
+            if row:
+                lines.append(f"  #{row[0]:<8} {row[1][:90]!r} - {row[2]}")
+        lines.append("")
+    if len(groups) > limit:
+        lines.append(f"... and {len(groups) - limit} more groups.")
+    return "\n".join(lines)
 
 
 # ------------------------------------------------------------------------------
@@ -253,6 +3462,92 @@ class PlaceholderEntry(Entry):
         return self.get()
 
 
+class Autocomplete:
+    """
+    Drop-down suggestions under an author or category Entry, looked up in the name
+    index on every keystroke, so an existing spelling is picked instead of typed again
+    with a variation. Up/Down move through the list, Return or Tab takes the highlighted
+    name and Escape closes it. The index is built in the background if need be.
+    """
+
+    def __init__(self, entry, column, limit=AUTOCOMPLETE_LIMIT):
+        self.entry = entry
+        self.column = column
+        self.limit = limit
+        self.popup = None
+        self.listbox = None
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+        entry.bind("<Down>", lambda event: self._move(1), add="+")
+        entry.bind("<Up>", lambda event: self._move(-1), add="+")
+        entry.bind("<Return>", self._accept, add="+")
+        entry.bind("<Tab>", self._accept, add="+")
+        entry.bind("<Escape>", lambda event: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda event: entry.after(150, self._hide_unless_focused), add="+")
+        entry.bind("<Destroy>", lambda event: self.hide(), add="+")
+        if peek_name_index(column) is None:
+            run_in_background(get_name_index, column, key=("names", column), description=None)
+
+    def _on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Tab", "Escape"):
+            return
+        text = self.entry.get().strip()
+        index = peek_name_index(self.column)
+        names = index.complete(text, self.limit) if index is not None and text else []
+        if not names or names == [text]:
+            self.hide()
+        else:
+            self.show(names)
+
+    def show(self, names):
+        if self.popup is None:
+            self.popup = Toplevel(self.entry)
+            self.popup.overrideredirect(True)
+            self.listbox = Listbox(self.popup, font=TEXT_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR,
+                                   selectbackground=ACCENT_COLOR, selectforeground=BACKGROUND_COLOR,
+                                   bd=0, highlightthickness=0, activestyle="none", exportselection=False)
+            self.listbox.pack(fill=BOTH, expand=True)
+            self.listbox.bind("<ButtonRelease-1>", self._accept)
+        self.listbox.delete(0, END)
+        for name in names:
+            self.listbox.insert(END, name)
+        self.listbox.configure(height=len(names))
+        self.listbox.update_idletasks()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}"
+                            f"+{self.entry.winfo_rootx()}+{self.entry.winfo_rooty() + self.entry.winfo_height()}")
+        self.popup.lift()
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.destroy()
+            self.popup = self.listbox = None
+
+    def _hide_unless_focused(self):
+        if self.popup is not None and self.entry.focus_get() is not self.listbox:
+            self.hide()
+
+    def _move(self, step):
+        if self.listbox is None:
+            return None
+        current = self.listbox.curselection()
+        index = max(0, min(self.listbox.size() - 1, current[0] + step if current else 0))
+        self.listbox.selection_clear(0, END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def _accept(self, event=None):
+        if self.listbox is None or not self.listbox.curselection():
+            self.hide()
+            return None
+        name = self.listbox.get(self.listbox.curselection()[0])
+        self.entry.delete(0, END)
+        self.entry.insert(0, name)
+        self.entry.icursor(END)
+        self.entry.focus_set()
+        self.hide()
+        return "break"
+
+
 # ------------------------------------------------------------------------------
 # Theme and UI Helpers
 # ------------------------------------------------------------------------------
@@ -265,7 +3560,7 @@ def setup_theme():
                     foreground=FOREGROUND_COLOR,
                     fieldbackground=BACKGROUND_COLOR,
                     font=TEXT_FONT,
-                    rowheight=80,  # Spacious rows for better readability
+                    rowheight=ROW_HEIGHT,  # Spacious rows for better readability
                     borderwidth=0,  # Remove outer border for cleaner look
                     relief="flat")
     # Add a style map to highlight selected rows with accent color and white text
@@ -315,12 +3610,547 @@ def center_window(window, width, height):
     window.geometry(f"{width}x{height}+{x}+{y}")
 
 
+# ------------------------------------------------------------------------------
+# Background Worker
+# ------------------------------------------------------------------------------
+class BackgroundWorker:
+    """
+    Runs data functions on a thread pool so the Tk mainloop never waits on MySQL.
+    Finished calls are handed back to the Tk thread by polling with root.after().
+    Calls submitted with description=None run without showing in the status bar.
+    A call submitted with a key supersedes earlier calls with the same key: they are
+    cancelled if they have not started yet, and their results are dropped otherwise.
+    """
+
+    def __init__(self, root, threads=WORKER_THREADS):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="quotekeeper-db")
+        self.finished = queue.Queue()
+        self.pending = {}   # ticket -> description of calls still running
+        self.latest = {}    # key -> (ticket, future) of the newest call with that key
+        self._tickets = itertools.count(1)
+        self._polling = False
+        self._status_text = None  # Progress text we put in the status bar
+
+    def submit(self, func, *args, on_done=None, on_error=None, key=None, description="Loading..."):
+        ticket = next(self._tickets)
+        if key is not None and key in self.latest:
+            self.latest[key][1].cancel()
+        future = self.executor.submit(func, *args)
+        if key is not None:
+            self.latest[key] = (ticket, future)
+        self.pending[ticket] = description
+        future.add_done_callback(lambda f: self.finished.put((ticket, key, f, on_done, on_error)))
+        self._show_progress()
+        if not self._polling:
+            self._polling = True
+            self.root.after(WORKER_POLL_MS, self._poll)
+        return ticket
+
+    def _poll(self):
+        while True:
+            try:
+                ticket, key, future, on_done, on_error = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.pop(ticket, None)
+            if key is not None:
+                if self.latest.get(key, (None,))[0] != ticket:
+                    continue  # Superseded by a newer request
+                del self.latest[key]
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                (on_error or self.report_error)(error)
+            elif on_done:
+                on_done(future.result())
+        self._show_progress()
+        if self.pending:
+            self.root.after(WORKER_POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _show_progress(self):
+        if not app_status_label:
+            return
+        descriptions = [description for description in self.pending.values() if description]
+        if descriptions:
+            text = descriptions[-1]
+            if len(descriptions) > 1:
+                text += f" ({len(descriptions)} tasks running)"
+            self._status_text = text
+            app_status_label.config(text=text)
+        elif self._status_text is not None:
+            # Only reset the label if nothing else has replaced our progress text.
+            if app_status_label.cget("text") == self._status_text:
+                app_status_label.config(text="Ready")
+            self._status_text = None
+
+    @staticmethod
+    def report_error(error):
+        messagebox.showerror("Error", f"Database error: {error}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_in_background(func, *args, on_done=None, on_error=None, key=None, description="Loading..."):
+    """
+    Run a data function on the background worker and pass its result to on_done on the
+    Tk thread. Without a worker (no main window yet) the function simply runs inline.
+    """
+    if app_worker is None:
+        result = func(*args)
+        if on_done:
+            on_done(result)
+        return
+    app_worker.submit(func, *args, on_done=on_done, on_error=on_error, key=key, description=description)
+
+
+# ------------------------------------------------------------------------------
+# Live Search
+# ------------------------------------------------------------------------------
+class LiveSearch:
+    """
+    Search-as-you-type shared by the main window and the Categories/Authors popups.
+    Keystrokes restart a short timer and the search runs on the background worker once
+    typing pauses, superseding any search still in flight. When the new text extends
+    the previous one and that result set was complete, the previous results are
+    narrowed in memory with `refine` instead of querying again.
+
+    fetch(text) -> (results, complete) runs in the background;
+    refine(results, text) -> results and on_results(text, results) run on the Tk thread.
+    """
+
+    def __init__(self, widget, fetch, refine, on_results, key, delay=LIVE_SEARCH_DELAY_MS):
+        self.widget = widget
+        self.fetch = fetch
+        self.refine = refine
+        self.on_results = on_results
+        self.key = key
+        self.delay = delay
+        self.last_text = None
+        self.last_results = None
+        self.last_complete = False
+        self.last_generation = None
+        self._timer = None
+        self._request = 0
+        self._requested_text = None
+
+    def attach(self, entry, get_text=None):
+        """Search whenever typing pauses in an Entry."""
+        get_text = get_text or entry.get
+        entry.bind("<KeyRelease>", lambda event: self.schedule(get_text()), add="+")
+
+    def schedule(self, text):
+        self._cancel_timer()
+        if text != self._requested_text:
+            self._timer = self.widget.after(self.delay, lambda: self.search_now(text))
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def search_now(self, text):
+        self._cancel_timer()
+        self._request += 1
+        self._requested_text = text
+        request = self._request
+        if (self.last_complete and self.last_text is not None and text.startswith(self.last_text)
+                and self.last_generation == _write_generation):
+            self._deliver(text, self.refine(self.last_results, text), True, self.last_generation)
+            return
+        generation = _write_generation
+
+        def fetched(result):
+            if request == self._request:
+                self._deliver(text, result[0], result[1], generation)
+
+        run_in_background(self.fetch, text, on_done=fetched, key=self.key, description="Searching...")
+
+    def _deliver(self, text, results, complete, generation):
+        if not self.widget.winfo_exists():
+            return
+        self.last_text = text
+        self.last_results = results
+        self.last_complete = complete
+        self.last_generation = generation
+        self.on_results(text, results)
+
+
+def get_live_search(tree):
+    """Return the live search feeding a quote Treeview, creating it on first use."""
+    live_search = getattr(tree, "live_search", None)
+    if live_search is None:
+        live_search = LiveSearch(tree, fetch_search_results, refine_search_results,
+                                 lambda text, results: show_search_results(tree, text, results), key="search")
+        tree.live_search = live_search
+    return live_search
+
+
+# ------------------------------------------------------------------------------
+# Virtual Quote List
+# ------------------------------------------------------------------------------
+class VirtualQuoteList:
+    """
+    Drives a Treeview in virtual mode: only the rows in the viewport (plus a small
+    buffer) exist as Treeview items. Rows are fetched from the current QuoteQuery a
+    page at a time as the scrollbar moves, and the scrollbar reflects the full
+    COUNT(*) rather than the number of materialized items. Counts and pages are
+    fetched in the background; rows still loading show as placeholders. The selection
+    is kept as a set of quote ids, so it survives scrolling and can span the whole view.
+    """
+
+    def __init__(self, tree, scrollbar, page_size=PAGE_SIZE, buffer=VIRTUAL_BUFFER):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        self.buffer = buffer
+        self.query = None
+        self.total = 0
+        self.offset = 0              # Index of the first row in the viewport
+        self.pages = OrderedDict()   # page number -> rows, least recently used first
+        self.loading = set()         # Pages currently being fetched
+        self.generation = 0          # Bumped on refresh so late pages of an old result are dropped
+        self.selected = set()        # Ids of the selected quotes, visible or not
+        self._rendering = False
+        scrollbar.configure(command=self.yview)
+        tree.bind("<Configure>", lambda event: self.render())
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda event: self.scroll(-1))
+        tree.bind("<Button-5>", lambda event: self.scroll(1))
+        tree.bind("<Up>", lambda event: self._on_arrow(-1))
+        tree.bind("<Down>", lambda event: self._on_arrow(1))
+        tree.bind("<Button-1>", self._on_click)
+        tree.bind("<<TreeviewSelect>>", self._on_select)
+        tree.bind("<Prior>", lambda event: self.scroll(-self.visible_rows()))
+        tree.bind("<Next>", lambda event: self.scroll(self.visible_rows()))
+
+    def visible_rows(self):
+        return max(1, self.tree.winfo_height() // ROW_HEIGHT)
+
+    def set_query(self, query, on_loaded=None):
+        """Show a new query from the top, clearing the selection."""
+        self.query = query
+        self.offset = 0
+        self.selected.clear()
+        self.refresh(on_loaded)
+
+    def refresh(self, on_loaded=None):
+        """Re-count and re-fetch the current query, keeping the scroll position."""
+        self.generation += 1
+        self.pages.clear()
+        self.loading.clear()
+        query = self.query
+
+        def counted(total):
+            if query is not self.query:
+                return
+            self.total = total
+            self.render()
+            update_quote_count()
+            if on_loaded:
+                on_loaded(total)
+
+        run_in_background(query.count, on_done=counted, key=("count", id(self)),
+                          description="Counting quotes...")
+
+    def sort(self, query):
+        """
+        Show the current rows in a new order. When every row is already cached they are
+        sorted in memory, e.g. when reversing a sort; otherwise the query is shown afresh.
+        """
+        rows = [row for page in sorted(self.pages) for row in self.pages[page]]
+        if self.query is None or self.loading or len(rows) != self.total:
+            self.query = query  # The same rows, so the selection is kept
+            self.offset = 0
+            self.refresh()
+            return
+        sort_rows(rows, getattr(query, "sort_keys", ()))
+        self.query = query
+        self.generation += 1
+        self.pages = OrderedDict((number, rows[start:start + self.page_size])
+                                 for number, start in enumerate(range(0, len(rows), self.page_size)))
+        self.render()
+
+    def _request_page(self, page):
+        """Fetch a page of the current query in the background."""
+        if page in self.loading:
+            return
+        self.loading.add(page)
+        generation = self.generation
+        # Scrolling on from a full cached page seeks past its last id instead of OFFSET.
+        previous = self.pages.get(page - 1)
+        after_id = 0 if page == 0 else None
+        if previous is not None and len(previous) == self.page_size:
+            after_id = previous[-1][0]
+
+        def loaded(rows):
+            if generation != self.generation:
+                return
+            self.loading.discard(page)
+            self.pages[page] = rows
+            if len(self.pages) > MAX_CACHED_PAGES:
+                self.pages.popitem(last=False)
+            if not self._rendering:
+                self.render()
+
+        def failed(error):
+            self.loading.discard(page)
+            BackgroundWorker.report_error(error)
+
+        run_in_background(fetch_page, self.query, page * self.page_size, self.page_size, after_id,
+                          on_done=loaded, on_error=failed, description="Loading quotes...")
+
+    def get_rows(self, start, count):
+        """
+        Return rows start..start+count of the current query. Pages not in memory are
+        requested and stand in as placeholder rows until they arrive.
+        """
+        end = min(start + count, self.total)
+        rows = []
+        if end <= start:
+            return rows
+        for page in range(start // self.page_size, (end - 1) // self.page_size + 1):
+            if page not in self.pages:
+                self._request_page(page)
+            page_start = page * self.page_size
+            first, last = max(start, page_start), min(end, page_start + self.page_size)
+            if page in self.pages:
+                self.pages.move_to_end(page)
+                rows.extend(self.pages[page][first - page_start:last - page_start])
+            else:
+                rows.extend(("", "Loading...", "", "") for _ in range(last - first))
+        return rows
+
+    def render(self):
+        """Materialize the rows currently in the viewport."""
+        self._rendering = True
+        visible = self.visible_rows()
+        self.offset = max(0, min(self.offset, self.total - visible))
+        rows = self.get_rows(self.offset, visible + self.buffer)
+        with timed("tree.insert"):
+            self.tree.delete(*self.tree.get_children())
+            for row in rows:
+                # Rows are keyed by quote id, so the selection maps back to quotes without reading values.
+                iid = str(row[0]) if row[0] != "" and not self.tree.exists(str(row[0])) else None
+                item = self.tree.insert("", "end", iid=iid, values=row)
+                if row[0] in self.selected:
+                    self.tree.selection_add(item)
+        self.tree.yview_moveto(0)
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(self.offset + visible, self.total) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+        self._rendering = False
+
+    def _find(self, quote_id):
+        """Return (page, index) of a quote among the cached pages, or None."""
+        for page, rows in self.pages.items():
+            for index, row in enumerate(rows):
+                if row[0] == quote_id:
+                    return page, index
+        return None
+
+    def patch(self, changes, added=False):
+        """
+        Apply added, changed or deleted (row is None) quotes, as (quote_id, row) pairs,
+        to the cached pages and re-render the viewport once. Falls back to a refresh only
+        when a row's position can't be worked out locally.
+        """
+        for quote_id, row in changes:
+            if row is None:
+                self.selected.discard(quote_id)
+        if self.query is None:
+            return
+        if added:
+            for quote_id, row in changes:
+                if self._find(quote_id) is not None:
+                    continue  # Already listed, e.g. by a refresh that raced the change poller
+                matches = self.query.matches(row)
+                if matches is None or (matches and self.query.order_by != "id"):
+                    self.refresh()
+                    return
+                if matches:
+                    # New ids are the largest, so the row goes at the end of an id-ordered view.
+                    page, index = divmod(self.total, self.page_size)
+                    if page in self.pages and len(self.pages[page]) == index:
+                        self.pages[page].append(row)
+                    self.total += 1
+        else:
+            # Locate every row before changing anything, as removals shift the pages.
+            removed = []
+            for quote_id, row in changes:
+                matches = row is not None and self.query.matches(row)
+                location = self._find(quote_id)
+                if matches is None or location is None or \
+                        (matches and sort_moves(self.query, self.pages[location[0]][location[1]], row)):
+                    self.refresh()
+                    return
+                if matches:
+                    self.pages[location[0]][location[1]] = row
+                else:
+                    removed.append(location[0])
+            if removed:
+                # Later rows shift up, so pages from the first removal on are re-fetched on demand.
+                for page in [p for p in self.pages if p >= min(removed)]:
+                    del self.pages[page]
+                self.generation += 1
+                self.loading.clear()
+                self.total -= len(removed)
+        self.render()
+        update_quote_count()
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command handler ('moveto' fraction or 'scroll' n units/pages)."""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.total)
+            self.render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.scroll(amount * self.visible_rows() if args[2] == "pages" else amount)
+
+    def _on_mousewheel(self, event):
+        return self.scroll(-1 if event.delta > 0 else 1)
+
+    def _on_click(self, event):
+        """A plain click on a row starts a new selection, dropping rows scrolled out of view too."""
+        if not event.state & 0x0005 and self.tree.identify_region(event.x, event.y) in ("cell", "tree"):
+            self.selected.clear()
+
+    def _on_select(self, event):
+        """Mirror the Treeview's selection of the visible rows into `selected`."""
+        if self._rendering:
+            return
+        selection = set(self.tree.selection())
+        for item in self.tree.get_children():
+            if item.isdigit():
+                if item in selection:
+                    self.selected.add(int(item))
+                else:
+                    self.selected.discard(int(item))
+
+    def select_all(self):
+        """Select every quote in the current view, not just the rows materialized on screen."""
+        query = self.query
+        if query is None:
+            return
+
+        def selected(quote_ids):
+            if query is self.query:
+                self.selected = set(quote_ids)
+                self.render()
+                if app_status_label:
+                    app_status_label.config(text=f"{len(quote_ids)} quotes selected")
+
+        run_in_background(query_ids, query, on_done=selected, key=("select-all", id(self)),
+                          description="Selecting quotes...")
+
+    def _on_arrow(self, step):
+        """Move the selection with the arrow keys, scrolling when it leaves the viewport."""
+        self.selected.clear()
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        index = children.index(focus) + step if focus in children else 0
+        visible = self.visible_rows()
+        if index < 0:
+            self.scroll(-1)
+            index = 0
+        elif index >= visible:
+            self.scroll(1)
+            index = visible - 1
+        children = self.tree.get_children()
+        if children:
+            item = children[min(index, len(children) - 1)]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        return "break"
+
+
+def get_virtual_list(tree):
+    """Return the VirtualQuoteList driving a Treeview, or None in normal mode."""
+    return getattr(tree, "virtual_list", None)
+
+
+# ------------------------------------------------------------------------------
+# Column Sorting
+# ------------------------------------------------------------------------------
+HEADING_TITLES = {"ID": "", "Quote": "Quote", "Author": "Author", "Category": "Category"}
+
+
+def sort_quotes(tree, column, add=False):
+    """
+    Heading click: sort the list by a column, or reverse it if the list is already
+    sorted by it. With add (Shift-click) the column becomes the next sort key instead,
+    e.g. category then author, and clicking it again reverses just that key.
+    """
+    keys = list(getattr(tree, "sort_keys", ()))
+    current = dict(keys)
+    if add and column in current:
+        keys = [(name, not descending if name == column else descending) for name, descending in keys]
+    elif add:
+        keys.append((column, False))
+    elif keys and keys[0][0] == column:
+        keys = [(column, not keys[0][1])]
+    else:
+        keys = [(column, False)]
+    tree.sort_keys = normalize_sort(keys)
+    update_sort_headings(tree)
+
+    virtual_list = get_virtual_list(tree)
+    query = virtual_list.query if virtual_list else getattr(tree, "quote_query", None)
+    if query is None:
+        return
+    ordered = sort_query(query, tree.sort_keys)
+    if virtual_list:
+        virtual_list.sort(ordered)
+    elif tree.quote_loaded >= tree.quote_total:
+        # Every row is already in the Treeview: reorder the items instead of fetching them again.
+        rows = sort_rows([(int(item),) + tuple(tree.item(item, "values"))[1:] for item in tree.get_children()],
+                         tree.sort_keys)
+        for position, row in enumerate(rows):
+            tree.move(str(row[0]), "", position)
+        tree.quote_query = ordered
+    else:
+        show_quotes(tree, ordered)
+
+
+def on_heading_shift_click(tree, event):
+    """Shift-click on a heading adds its column to the sort keys."""
+    if tree.identify_region(event.x, event.y) != "heading":
+        return None
+    column = tree.identify_column(event.x)  # "#1", "#2", ... in display order
+    sort_quotes(tree, tree["columns"][int(column[1:]) - 1], add=True)
+    return "break"
+
+
+def update_sort_headings(tree):
+    """Mark the sorted columns with an arrow, numbered when there is more than one key."""
+    keys = tree.sort_keys
+    for column, title in HEADING_TITLES.items():
+        text = title
+        for number, (name, descending) in enumerate(keys, 1):
+            if name == column:
+                arrow = "\u25bc" if descending else "\u25b2"
+                text = f"{title} {arrow}{number if len(keys) > 1 else ''}".strip()
+        tree.heading(column, text=text)
+
+
 # ------------------------------------------------------------------------------
 # Main Window and Sub-Windows
 # ------------------------------------------------------------------------------
 def create_main_window():
     global tree  # Make the Treeview variable global so callbacks can access it.
+    global app_worker
     root = tk.Tk()
+    app_worker = BackgroundWorker(root)
     root.title("QuoteKeeper")
     root.geometry("1000x700")
     root.configure(bg=BACKGROUND_COLOR)
@@ -345,6 +4175,7 @@ def create_main_window():
     search_button = create_rounded_button(search_frame, "Search", ACCENT_COLOR, BACKGROUND_COLOR,
                                           lambda: search_quotes(tree, search_entry.get_text()))
     search_button.pack(side=LEFT)
+    search_entry.bind("<Return>", lambda event: search_quotes(tree, search_entry.get_text()))
 
     # Main Content Frame
     content_frame = Frame(root, bg=BACKGROUND_COLOR, padx=30, pady=20)
@@ -388,14 +4219,26 @@ def create_main_window():
     tree = ttk.Treeview(inner_tree_frame,
                         columns=("ID", "Quote", "Author", "Category"),
                         show="headings",
+                        selectmode="extended",
                         yscrollcommand=v_scrollbar.set,
                         xscrollcommand=h_scrollbar.set)
     v_scrollbar.configure(command=tree.yview)
     h_scrollbar.configure(command=tree.xview)
+    if VIRTUAL_LIST:
+        # The scrollbar tracks the full result set, not the handful of materialized rows.
+        tree.configure(yscrollcommand="")
+        tree.virtual_list = VirtualQuoteList(tree, v_scrollbar)
+    else:
+        tree.configure(yscrollcommand=lambda first, last: on_tree_scrolled(tree, v_scrollbar, first, last))
+        tree.bind("<End>", lambda event: load_more_quotes(tree))
     tree.heading("ID", text="")
     tree.heading("Quote", text="Quote")
     tree.heading("Author", text="Author")
     tree.heading("Category", text="Category")
+    tree.sort_keys = []
+    for column in SORT_COLUMNS:
+        tree.heading(column, command=lambda column=column: sort_quotes(tree, column))
+    tree.bind("<Shift-Button-1>", lambda event: on_heading_shift_click(tree, event))
     tree.column("ID", width=50, minwidth=50, anchor=CENTER)
     tree.column("Quote", width=600, minwidth=300)
     tree.column("Author", width=200, minwidth=150)
@@ -404,6 +4247,29 @@ def create_main_window():
     h_scrollbar.pack(side=BOTTOM, fill=X)
     tree.pack(side=LEFT, fill=BOTH, expand=True, padx=5, pady=5)
     tree.bind("<Double-1>", lambda event: view_quote_details(tree))
+    tree.bind("<Delete>", lambda event: delete_quote(tree))
+    tree.bind("<Control-a>", lambda event: select_all_quotes(tree) or "break")
+    get_live_search(tree).attach(search_entry, search_entry.get_text)
+
+    # Menu
+    menubar = tk.Menu(root)
+    file_menu = tk.Menu(menubar, tearoff=0)
+    file_menu.add_command(label="Import Quotes...", command=lambda: import_quotes_dialog(tree))
+    file_menu.add_command(label="Export Quotes...", command=lambda: export_quotes_dialog(tree))
+    menubar.add_cascade(label="File", menu=file_menu)
+    edit_menu = tk.Menu(menubar, tearoff=0)
+    edit_menu.add_command(label="Select All", accelerator="Ctrl+A",
+                          command=lambda: select_all_quotes(tree))
+    edit_menu.add_command(label="Delete Selected", accelerator="Delete", command=lambda: delete_quote(tree))
+    edit_menu.add_separator()
+    edit_menu.add_command(label="Set Category of Selected...", command=lambda: bulk_edit_quotes(tree, "category"))
+    edit_menu.add_command(label="Set Author of Selected...", command=lambda: bulk_edit_quotes(tree, "author"))
+    menubar.add_cascade(label="Edit", menu=edit_menu)
+    tools_menu = tk.Menu(menubar, tearoff=0)
+    tools_menu.add_command(label="Find Duplicates...", command=lambda: show_duplicate_report(tree))
+    tools_menu.add_command(label="Diagnostics...", command=show_diagnostics)
+    menubar.add_cascade(label="Tools", menu=tools_menu)
+    root.config(menu=menubar)
 
     # Status Bar
     status_frame = Frame(root, bg=COMMENT_COLOR, height=30)
@@ -416,6 +4282,8 @@ def create_main_window():
 
 
 def create_add_quote_window(tree):
+    if not require_online():
+        return
     add_window = Toplevel()
     add_window.title("QuoteKeeper - Add New Quote")
     add_window.geometry("450x400")
@@ -441,11 +4309,13 @@ def create_add_quote_window(tree):
     author_entry = Entry(input_frame, font=TEXT_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR,
                          insertbackground=FOREGROUND_COLOR, bd=0)
     author_entry.pack(fill=X, ipady=6, pady=(0, 10))
+    Autocomplete(author_entry, "author")
     category_label = Label(input_frame, text="Category", font=TEXT_FONT, bg=BACKGROUND_COLOR, fg=FOREGROUND_COLOR)
     category_label.pack(anchor=W, pady=(0, 5))
     category_entry = Entry(input_frame, font=TEXT_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR,
                            insertbackground=FOREGROUND_COLOR, bd=0)
     category_entry.pack(fill=X, ipady=6)
+    Autocomplete(category_entry, "category")
     button_frame = Frame(add_window, bg=BACKGROUND_COLOR, padx=20, pady=15)
     button_frame.pack(fill=X)
 
@@ -456,8 +4326,19 @@ def create_add_quote_window(tree):
         if not quote_content or not author_content or not category_content:
             messagebox.showerror("Error", "All fields are required")
             return
-        if add_quote(quote_content, author_content, category_content, tree):
-            add_window.destroy()
+
+        def checked(duplicates):
+            if duplicates and not confirm_duplicate(duplicates, add_window):
+                return
+            # The window stays open if the write fails, so nothing typed is lost.
+            add_quote(quote_content, author_content, category_content, tree,
+                      on_done=lambda row: add_window.destroy())
+
+        if DEDUP_CHECK_ON_ADD:
+            run_in_background(find_duplicates_of, quote_content, on_done=checked,
+                              description="Checking for duplicates...")
+        else:
+            checked([])
 
     # Setting both "Save" and "Cancel" buttons to dark brown (#5D4037)
     save_button = create_rounded_button(button_frame, "Save", "#5D4037", BACKGROUND_COLOR, save_quote, bold=True)
@@ -466,13 +4347,36 @@ def create_add_quote_window(tree):
     cancel_button.pack(side=RIGHT)
 
 
+def confirm_duplicate(duplicates, parent, question="Add it anyway?"):
+    """Ask whether to save a quote that matches existing ones anyway."""
+    lines = [f'#{row[0]}  "{row[1][:120]}" - {row[2]}  '
+             f'({"exact duplicate" if exact else f"{similarity:.0%} similar"})'
+             for row, similarity, exact in duplicates]
+    return messagebox.askyesno("Possible Duplicate", "This quote looks like one you already have:\n\n"
+                               + "\n".join(lines) + f"\n\n{question}", parent=parent)
+
+
+def open_quote(quote_id, on_done):
+    """Pass a quote to on_done: straight from the quote model or cache, or after a background read."""
+    row = _quote_model.get(quote_id) if _quote_model else None
+    quote_data = row[1:] if row else _quote_cache.get(quote_id)
+    update_quote_count()
+    if quote_data is not None:
+        on_done(quote_data)
+    else:
+        run_in_background(load_quote, quote_id, key="open-quote", on_done=on_done)
+
+
 def view_quote_details(tree):
-    selected = tree.selection()
-    if not selected:
+    quote_ids = selected_quote_ids(tree)
+    if not quote_ids:
         messagebox.showerror("Error", "Please select a quote to view")
         return
-    quote_id = tree.item(selected[0])['values'][0]
-    quote_data = get_quote_by_id(quote_id)
+    quote_id = quote_ids[0]
+    open_quote(quote_id, lambda quote_data: show_quote_details(tree, quote_data))
+
+
+def show_quote_details(tree, quote_data):
     if not quote_data:
         messagebox.showerror("Error", "Quote not found")
         return
@@ -508,12 +4412,17 @@ def view_quote_details(tree):
 
 
 def open_edit_quote_window(tree):
-    selected = tree.selection()
-    if not selected:
+    if not require_online():
+        return
+    quote_ids = selected_quote_ids(tree)
+    if not quote_ids:
         messagebox.showerror("Error", "Please select a quote to edit")
         return
-    quote_id = tree.item(selected[0])['values'][0]
-    quote_data = get_quote_by_id(quote_id)
+    quote_id = quote_ids[0]
+    open_quote(quote_id, lambda quote_data: create_edit_quote_window(tree, quote_id, quote_data))
+
+
+def create_edit_quote_window(tree, quote_id, quote_data):
     if not quote_data:
         messagebox.showerror("Error", "Quote not found")
         return
@@ -544,12 +4453,14 @@ def open_edit_quote_window(tree):
                          insertbackground=FOREGROUND_COLOR, bd=0)
     author_entry.pack(fill=X, ipady=6, pady=(0, 10))
     author_entry.insert(0, quote_data[1])
+    Autocomplete(author_entry, "author")
     category_label = Label(input_frame, text="Category", font=TEXT_FONT, bg=BACKGROUND_COLOR, fg=FOREGROUND_COLOR)
     category_label.pack(anchor=W, pady=(0, 5))
     category_entry = Entry(input_frame, font=TEXT_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR,
                            insertbackground=FOREGROUND_COLOR, bd=0)
     category_entry.pack(fill=X, ipady=6)
     category_entry.insert(0, quote_data[2])
+    Autocomplete(category_entry, "category")
     button_frame = Frame(edit_window, bg=BACKGROUND_COLOR, padx=20, pady=15)
     button_frame.pack(fill=X)
 
@@ -560,10 +4471,22 @@ def open_edit_quote_window(tree):
         if not quote_content or not author_content or not category_content:
             messagebox.showerror("Error", "All fields are required")
             return
-        if update_quote(quote_id, quote_content, author_content, category_content, tree):
+        def saved(row):
             messagebox.showinfo("Success", "Quote updated successfully!")
             edit_window.destroy()
 
+        def checked(duplicates):
+            if duplicates and not confirm_duplicate(duplicates, edit_window, "Save it anyway?"):
+                return
+            update_quote(quote_id, quote_content, author_content, category_content, tree, on_done=saved)
+
+        # Only a reworded quote is checked, and never against the quote being edited.
+        if DEDUP_CHECK_ON_ADD and quote_content != quote_data[0]:
+            run_in_background(find_duplicates_of, quote_content, quote_id, on_done=checked,
+                              description="Checking for duplicates...")
+        else:
+            checked([])
+
     update_button = create_rounded_button(button_frame, "Update Quote", YELLOW_COLOR, BACKGROUND_COLOR,
                                           save_edited_quote, bold=True)
     update_button.pack(side=LEFT)
@@ -610,32 +4533,14 @@ def list_categories(tree):
     canvas.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
 
-    def get_quote_count_by_category(category):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM quotes WHERE category=%s", (category,))
-        count = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
-        return count
+    categories = []  # (category, count) pairs matching the search box
 
-    def update_category_list():
+    def update_category_list(results=None):
+        if results is not None:
+            categories[:] = results
         for widget in scrollable_frame.winfo_children():
             widget.destroy()
-        conn = get_connection()
-        cursor = conn.cursor()
-        if sort_order.get() == "Asc":
-            cursor.execute("SELECT DISTINCT category FROM quotes ORDER BY category ASC")
-        else:
-            cursor.execute("SELECT DISTINCT category FROM quotes ORDER BY category DESC")
-        categories = [cat[0] for cat in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-        search_text = search_entry.get().lower()
-        if search_text:
-            categories = [cat for cat in categories if search_text in cat.lower()]
-        for category in categories:
-            count = get_quote_count_by_category(category)
+        for category, count in (categories[::-1] if sort_order.get() == "Desc" else categories):
             category_text = f"{category} ({count})"
             cat_frame = Frame(scrollable_frame, bg=BACKGROUND_COLOR, pady=6)
             cat_frame.pack(fill=X)
@@ -643,7 +4548,9 @@ def list_categories(tree):
             cat_label.pack(side=LEFT)
             cat_label.bind("<Button-1>", lambda event, c=category: (filter_quotes_by_category(tree, c), window.destroy()))
             cat_frame.bind("<Button-1>", lambda event, c=category: (filter_quotes_by_category(tree, c), window.destroy()))
-    search_entry.bind("<KeyRelease>", lambda event: update_category_list())
+    live_search = LiveSearch(window, lambda text: facet_search("category", text), refine_facet_search("category"),
+                             lambda text, results: update_category_list(results), key="category-facets")
+    live_search.attach(search_entry)
 
     def toggle_sort():
         if sort_order.get() == "Asc":
@@ -654,7 +4561,7 @@ def list_categories(tree):
         update_category_list()
 
     sort_btn.config(command=toggle_sort)
-    update_category_list()  # initial population
+    live_search.search_now("")  # initial population
 
     button_frame = Frame(window, bg=BACKGROUND_COLOR, padx=30, pady=10)
     button_frame.pack(fill=X)
@@ -703,39 +4610,23 @@ def list_authors(tree):
     canvas.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
 
-    def get_quote_count_by_author(author):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM quotes WHERE author=%s", (author,))
-        count = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
-        return count
+    authors = []  # (author, count) pairs matching the search box
 
-    def update_author_list():
+    def update_author_list(results=None):
+        if results is not None:
+            authors[:] = results
         for widget in scrollable_frame.winfo_children():
             widget.destroy()
-        conn = get_connection()
-        cursor = conn.cursor()
-        if sort_order.get() == "Asc":
-            cursor.execute("SELECT DISTINCT author FROM quotes ORDER BY author ASC")
-        else:
-            cursor.execute("SELECT DISTINCT author FROM quotes ORDER BY author DESC")
-        authors = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-        search_text = search_entry.get().lower()
-        if search_text:
-            authors = [auth for auth in authors if search_text in auth.lower()]
-        for author in authors:
-            count = get_quote_count_by_author(author)
+        for author, count in (authors[::-1] if sort_order.get() == "Desc" else authors):
             author_text = f"{author} ({count})"
             row_frame = Frame(scrollable_frame, bg=BACKGROUND_COLOR, pady=6)
             row_frame.pack(fill=X)
             auth_label = Label(row_frame, text=author_text, font=AUTHORS_ITEM_FONT, bg=BACKGROUND_COLOR, fg=FOREGROUND_COLOR, cursor="hand2")
             auth_label.pack(side=LEFT)
             auth_label.bind("<Button-1>", lambda event, a=author: (filter_quotes_by_author(tree, a), window.destroy()))
-    search_entry.bind("<KeyRelease>", lambda event: update_author_list())
+    live_search = LiveSearch(window, lambda text: facet_search("author", text), refine_facet_search("author"),
+                             lambda text, results: update_author_list(results), key="author-facets")
+    live_search.attach(search_entry)
 
     def toggle_sort():
         if sort_order.get() == "Asc":
@@ -746,7 +4637,7 @@ def list_authors(tree):
         update_author_list()
 
     sort_btn.config(command=toggle_sort)
-    update_author_list()
+    live_search.search_now("")
     button_frame = Frame(window, bg=BACKGROUND_COLOR, padx=30, pady=10)
     button_frame.pack(fill=X)
     show_all_button = create_rounded_button(button_frame, "Show All Quotes", GREEN_COLOR, BACKGROUND_COLOR,
@@ -759,28 +4650,910 @@ def list_authors(tree):
 
 def search_quotes(tree, query):
     """Search quotes by content, author or category."""
-    if not query:
+    get_live_search(tree).search_now(query)
+
+
+# ------------------------------------------------------------------------------
+# Bulk Import
+# ------------------------------------------------------------------------------
+SQL_INSERT_RE = re.compile(r"\s*INSERT\s+(?:IGNORE\s+)?INTO\s+`?quotes`?\s*\(([^)]*)\)\s*VALUES\s*(.*)",
+                           re.IGNORECASE | re.DOTALL)
+SQL_TUPLE_RE = re.compile(r"\(((?:'(?:[^'\\]|\\.|'')*'|[^)'])*)\)", re.DOTALL)
+SQL_VALUE_RE = re.compile(r"\s*(?:'((?:[^'\\]|\\.|'')*)'|(NULL)|([^,\s]+))\s*(?:,|$)",
+                          re.IGNORECASE | re.DOTALL)
+SQL_ESCAPE_RE = re.compile(r"\\.", re.DOTALL)
+SQL_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+
+def _unescape_sql(text):
+    return re.sub(r"\\(.)|''", lambda m: "'" if m.group(1) is None else SQL_ESCAPES.get(m.group(1), m.group(1)),
+                  text, flags=re.DOTALL)
+
+
+def read_sql_dump(file):
+    """
+    Stream records out of the INSERT INTO `quotes` statements of a SQL dump such as the
+    phpMyAdmin export in quotes_db, without a MySQL client. Tuples are parsed as their
+    lines arrive, so even a single huge extended INSERT is never held in memory.
+    """
+    columns = None    # Columns of the quotes INSERT being read, or None outside one
+    pending = ""      # Text of that INSERT not parsed yet
+    in_string = False
+    for line in file:
+        if columns is None:
+            match = None if in_string else SQL_INSERT_RE.match(line)
+            if match is None:
+                if SQL_ESCAPE_RE.sub("", line).count("'") % 2:
+                    in_string = not in_string
+                continue
+            columns = [column.strip(" `\n") for column in match.group(1).split(",")]
+            line = match.group(2)
+        pending += line
+        if SQL_ESCAPE_RE.sub("", line).count("'") % 2:
+            in_string = not in_string
+        if in_string:
+            continue
+        end = 0
+        for tuple_match in SQL_TUPLE_RE.finditer(pending):
+            values = []
+            for value in SQL_VALUE_RE.finditer(tuple_match.group(1)):
+                if value.group(2):
+                    values.append(None)
+                elif value.group(1) is not None:
+                    values.append(_unescape_sql(value.group(1)))
+                else:
+                    values.append(value.group(3))
+            yield dict(zip(columns, values))
+            end = tuple_match.end()
+        pending = pending[end:].lstrip(", \n")
+        if pending.startswith(";"):
+            columns, pending = None, ""
+
+
+def read_csv_quotes(file):
+    """Stream records from a CSV file with a header row."""
+    return csv.DictReader(file)
+
+
+def read_jsonl_quotes(file):
+    """Stream records from a JSON Lines file, one object per line."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+IMPORT_READERS = {"csv": read_csv_quotes, "jsonl": read_jsonl_quotes, "sql": read_sql_dump}
+
+
+def detect_import_format(path):
+    """Guess the format of an import file from its extension, or from its first lines."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".sql":
+        return "sql"
+    with open(path, encoding="utf-8") as file:
+        head = file.read(4096)
+    if head.lstrip().startswith("{"):
+        return "jsonl"
+    if re.search(r"^\s*(--|/\*|INSERT\s+INTO|CREATE\s+TABLE)", head, re.IGNORECASE | re.MULTILINE):
+        return "sql"
+    return "csv"
+
+
+def record_to_quote(record):
+    """Map an imported record onto (quote_text, author, category), or None if it has no quote."""
+    fields = {str(key).strip().lower(): value for key, value in record.items() if key is not None}
+    text = fields.get("quote_text") or fields.get("quote") or fields.get("text")
+    if not text or not str(text).strip():
+        return None
+    author = str(fields.get("author") or "Unknown").strip()
+    category = str(fields.get("category") or IMPORT_DEFAULT_CATEGORY).strip()
+    return str(text).strip(), author, category
+
+
+def quote_key(quote_text, author):
+    """
+    A compact fingerprint of a quote for duplicate detection during imports: the
+    exact_quote_key of the normalized text and author. Unlike the Add/Edit check, which
+    only warns, an import drops rows silently, so the same words credited to someone
+    else are kept.
+    """
+    return exact_quote_key(normalize_quote_text(quote_text) + "\x1f" + normalize_quote_text(author))
+
+
+def _existing_quote_keys():
+    keys = set()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT quote_text, author FROM quotes")
+    while True:
+        rows = cursor.fetchmany(IMPORT_BATCH_SIZE)
+        if not rows:
+            break
+        keys.update(quote_key(text, author) for text, author in rows)
+    cursor.close()
+    conn.close()
+    return keys
+
+
+def _load_data_batch(cursor, rows):
+    """Insert a batch through LOAD DATA LOCAL INFILE using a temporary tab-separated file."""
+    def escape(value):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv", delete=False) as file:
+        for row in rows:
+            file.write("\t".join(escape(value) for value in row) + "\n")
+    try:
+        cursor.execute("LOAD DATA LOCAL INFILE %s INTO TABLE quotes CHARACTER SET utf8mb4 "
+                       "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                       "(quote_text, author, category)", (file.name,))
+    finally:
+        os.remove(file.name)
+
+
+def import_quotes(path, file_format=None, batch_size=IMPORT_BATCH_SIZE, deduplicate=True,
+                  use_load_data=False, progress=None):
+    """
+    Stream quotes from a CSV, JSON Lines or SQL dump file into the database.
+    Rows are inserted in batches of `batch_size`, each committed as one transaction,
+    with executemany or LOAD DATA LOCAL INFILE. With `deduplicate`, quotes already in
+    the database or seen earlier in the file are skipped. progress(stats) is called
+    after every batch (from the calling thread). Returns the final stats.
+    """
+    file_format = file_format or detect_import_format(path)
+    reader = IMPORT_READERS[file_format]
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "skipped": 0, "seconds": 0.0, "rows_per_second": 0.0}
+    started = time.perf_counter()
+    seen = _existing_quote_keys() if deduplicate else None
+    if use_load_data:
+        if not get_backend().supports_load_data:
+            raise ValueError("LOAD DATA LOCAL INFILE is only available with the MySQL backend")
+        conn = get_backend().connect(allow_local_infile=True)
+    else:
+        conn = get_connection()
+    cursor = conn.cursor()
+
+    def flush(batch):
+        try:
+            if use_load_data:
+                _load_data_batch(cursor, batch)
+            else:
+                cursor.executemany("INSERT INTO quotes (quote_text, author, category) VALUES (%s, %s, %s)", batch)
+            conn.commit()
+        except DB_ERRORS:
+            conn.rollback()
+            raise
+        stats["inserted"] += len(batch)
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_second"] = stats["read"] / stats["seconds"] if stats["seconds"] else 0.0
+        if progress:
+            progress(dict(stats))
+
+    try:
+        batch = []
+        with open(path, encoding="utf-8", newline="") as file:
+            for record in reader(file):
+                stats["read"] += 1
+                quote = record_to_quote(record)
+                if quote is None:
+                    stats["skipped"] += 1
+                    continue
+                if seen is not None:
+                    key = quote_key(quote[0], quote[1])
+                    if key in seen:
+                        stats["duplicates"] += 1
+                        continue
+                    seen.add(key)
+                batch.append(quote)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+        if batch:
+            flush(batch)
+    finally:
+        cursor.close()
+        conn.close()
+        if stats["inserted"]:
+            quotes_changed()
+            reset_search_index()
+            reset_duplicate_index()
+            reset_quote_model()
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_second"] = stats["read"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def format_import_stats(stats):
+    return (f"Imported {stats['inserted']} quotes from {stats['read']} rows "
+            f"({stats['duplicates']} duplicates, {stats['skipped']} without quote text skipped) "
+            f"in {stats['seconds']:.1f}s - {stats['rows_per_second']:.0f} rows/s")
+
+
+def import_quotes_dialog(tree):
+    """Menu action: pick a file and import it in the background, showing throughput in the status bar."""
+    if not require_online():
+        return
+    path = filedialog.askopenfilename(title="QuoteKeeper - Import Quotes",
+                                      filetypes=[("Quote files", "*.csv *.jsonl *.ndjson *.json *.sql"),
+                                                 ("All files", "*")])
+    if not path:
+        return
+    progress = {}
+
+    def show_progress():
+        if progress.get("done"):
+            return
+        if app_status_label and progress:
+            app_status_label.config(text=f"Importing... {progress['read']} rows read, "
+                                         f"{progress['inserted']} inserted ({progress['rows_per_second']:.0f} rows/s)")
+        tree.after(500, show_progress)
+
+    def finished(stats):
+        progress["done"] = True
         load_quotes(tree)
+        if app_status_label:
+            app_status_label.config(text=format_import_stats(stats))
+        messagebox.showinfo("Import Complete", format_import_stats(stats))
+
+    def failed(error):
+        progress["done"] = True
+        messagebox.showerror("Error", f"Import failed: {error}")
+
+    run_in_background(lambda: import_quotes(path, progress=progress.update), on_done=finished, on_error=failed,
+                      description="Importing quotes...")
+    show_progress()
+
+
+# ------------------------------------------------------------------------------
+# Bulk Export
+# ------------------------------------------------------------------------------
+EXPORT_COLUMNS = ("id", "quote_text", "author", "category")
+
+
+def build_export_query(author=None, category=None, search=None):
+    """
+    The rows to export, filtered with the same predicates the main window uses.
+    Returns (query, extra_filters); extra_filters are checked in Python when the search
+    runs on the local index and can't be combined into one SQL statement.
+    """
+    filters = [author_query(author) if author else None, category_query(category) if category else None]
+    filters = [query for query in filters if query is not None]
+    if search:
+        searched = search_query(search)
+        if not isinstance(searched, QuoteQuery):
+            return searched, filters
+        return combine_queries(searched, *filters), []
+    return combine_queries(*filters), []
+
+
+def stream_query(query, chunk_size=EXPORT_CHUNK_SIZE, filters=()):
+    """
+    Yield the rows of a query in chunks. SQL queries are read through an unbuffered
+    cursor with fetchmany, so memory stays flat however large the table is.
+    """
+    if not isinstance(query, QuoteQuery):
+        offset = 0
+        while True:
+            rows = query.fetch(offset, chunk_size)
+            if not rows:
+                return
+            offset += len(rows)
+            rows = [row for row in rows if all(check.matches(row) for check in filters)]
+            if rows:
+                yield rows
+    conn = get_connection()
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(*query.select())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        # Closing an unbuffered cursor mid-result raises "Unread result found" on MySQL;
+        # the connection must still go back to the pool.
+        try:
+            cursor.close()
+        finally:
+            conn.close()
+
+
+def _write_csv(path, chunks):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def _write_jsonl(path, chunks):
+    with open(path, "w", encoding="utf-8") as file:
+        for rows in chunks:
+            file.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def _write_parquet(path, chunks):
+    """Columnar export; every chunk becomes one Parquet row group. Needs the optional pyarrow package."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export needs the pyarrow package (pip install pyarrow)")
+    schema = pyarrow.schema([("id", pyarrow.int64()), ("quote_text", pyarrow.string()),
+                             ("author", pyarrow.string()), ("category", pyarrow.string())])
+    with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pyarrow.Table.from_arrays([pyarrow.array(column) for column in columns],
+                                                         schema=schema))
+
+
+EXPORT_WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def detect_export_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".parquet":
+        return "parquet"
+    return "csv"
+
+
+def export_quotes(path, file_format=None, query=None, filters=(), chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    Stream the rows of `query` (all quotes by default) to a CSV, JSON Lines or Parquet
+    file, chunk by chunk. progress(stats) is called after every chunk. Returns the stats.
+    """
+    file_format = file_format or detect_export_format(path)
+    stats = {"exported": 0, "seconds": 0.0, "rows_per_second": 0.0}
+    started = time.perf_counter()
+
+    def counted(chunks):
+        for rows in chunks:
+            yield rows
+            stats["exported"] += len(rows)
+            stats["seconds"] = time.perf_counter() - started
+            stats["rows_per_second"] = stats["exported"] / stats["seconds"] if stats["seconds"] else 0.0
+            if progress:
+                progress(dict(stats))
+
+    EXPORT_WRITERS[file_format](path, counted(stream_query(query or QuoteQuery(), chunk_size, filters)))
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def format_export_stats(stats, path):
+    return f"Exported {stats['exported']} quotes to {os.path.basename(path)} in {stats['seconds']:.1f}s"
+
+
+def export_quotes_dialog(tree):
+    """Menu action: export the quotes in the current view (filter or search) to a file."""
+    path = filedialog.asksaveasfilename(title="QuoteKeeper - Export Quotes", defaultextension=".csv",
+                                        filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"),
+                                                   ("Parquet", "*.parquet")])
+    if not path:
         return
-    tree.delete(*tree.get_children())
+    virtual_list = get_virtual_list(tree)
+    query = virtual_list.query if virtual_list else getattr(tree, "quote_query", None)
+    query = getattr(query, "source", query)  # Export a live-search result from the database
+    run_in_background(lambda: export_quotes(path, query=query),
+                      on_done=lambda stats: messagebox.showinfo("Export Complete", format_export_stats(stats, path)),
+                      on_error=lambda error: messagebox.showerror("Error", f"Export failed: {error}"),
+                      description="Exporting quotes...")
+
+
+# ------------------------------------------------------------------------------
+# Diagnostics Window
+# ------------------------------------------------------------------------------
+def format_metrics(snapshot):
+    """Render a metrics snapshot as the plain-text report shown in the diagnostics window."""
+    lines = [f"Uptime: {snapshot['uptime_s']:.0f}s", "",
+             f"{'Operation':<24}{'Count':>8}{'Mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'Max':>10}  (ms)"]
+    for name, stats in snapshot["operations"].items():
+        lines.append(f"{name:<24}{stats['count']:>8}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}"
+                     f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    pool = snapshot["pool"]
+    if pool:
+        lines += ["", "Connection pool: " + ", ".join(f"{key}={value}" for key, value in pool.items())]
+    cache = snapshot["quote_cache"]
+    lines += ["Quote cache: " + ", ".join(f"{key}={value:.0%}" if key == "hit_rate" else f"{key}={value}"
+                                          for key, value in cache.items())]
+    model = snapshot["quote_model"]
+    lines += ["Quote model: " + (", ".join(f"{key}={value}" for key, value in model.items()) if model else
+                                 "not loaded")]
+    lines += ["", f"Slow queries (>= {SLOW_QUERY_MS} ms), newest first:"]
+    for entry in reversed(snapshot["slow_queries"]):
+        lines.append(f"{entry['time']}  {entry['ms']:>8.1f} ms  {entry['sql']}  {entry['params']}")
+    return "\n".join(lines)
+
+
+def show_diagnostics():
+    """Tools menu: live latency histograms, pool and cache counters and the slow-query log."""
+    window = Toplevel()
+    window.title("QuoteKeeper - Diagnostics")
+    window.geometry("900x500")
+    window.configure(bg=BACKGROUND_COLOR)
+    report = Text(window, font=MONO_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR, wrap="none", bd=0)
+    report.pack(fill=BOTH, expand=True, padx=15, pady=(15, 5))
+
+    def refresh():
+        if not window.winfo_exists():
+            return
+        report.config(state="normal")
+        report.delete("1.0", END)
+        report.insert(END, format_metrics(_metrics.snapshot()) if INSTRUMENT else
+                      "Instrumentation is off (QUOTEKEEPER_INSTRUMENT=0).")
+        report.config(state=DISABLED)
+        window.after(DIAGNOSTICS_REFRESH_MS, refresh)
+
+    def save():
+        path = filedialog.asksaveasfilename(title="QuoteKeeper - Save Metrics", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            _metrics.dump(path)
+
+    button_frame = Frame(window, bg=BACKGROUND_COLOR, padx=15, pady=10)
+    button_frame.pack(fill=X)
+    create_rounded_button(button_frame, "Reset", ORANGE_COLOR, BACKGROUND_COLOR, _metrics.reset).pack(side=LEFT)
+    create_rounded_button(button_frame, "Save...", GREEN_COLOR, BACKGROUND_COLOR, save).pack(side=LEFT, padx=10)
+    create_rounded_button(button_frame, "Close", COMMENT_COLOR, FOREGROUND_COLOR, window.destroy).pack(side=RIGHT)
+    refresh()
+
+
+# ------------------------------------------------------------------------------
+# Duplicate Report Window
+# ------------------------------------------------------------------------------
+def build_duplicate_report():
+    """Background part of the report: the groups plus the rows shown for the largest ones."""
+    groups = find_duplicate_groups()
+    shown = [quote_id for group in groups[:DEDUP_REPORT_GROUPS] for quote_id in group["ids"]]
+    return groups, get_quotes_by_ids(shown)
+
+
+def show_duplicate_report(tree):
+    """Tools menu: list duplicate groups and offer to delete the extra copies of exact ones."""
+
+    def built(result):
+        groups, rows = result
+        window = Toplevel()
+        window.title("QuoteKeeper - Duplicates")
+        window.geometry("900x550")
+        window.configure(bg=BACKGROUND_COLOR)
+        report = Text(window, font=MONO_FONT, bg=COMMENT_COLOR, fg=FOREGROUND_COLOR, wrap="none", bd=0)
+        report.pack(fill=BOTH, expand=True, padx=15, pady=(15, 5))
+        report.insert(END, format_duplicate_report(groups, rows))
+        report.config(state=DISABLED)
+        # The lowest id of each exact group is kept; near-duplicates are left for review.
+        extra_ids = [quote_id for group in groups if group["exact"] for quote_id in sorted(group["ids"])[1:]]
+
+        def delete_extra():
+            if not messagebox.askyesno("Delete Exact Duplicates",
+                                       f"Delete {len(extra_ids)} exact copies, keeping the oldest of each?",
+                                       parent=window):
+                return
+            window.destroy()
+            run_in_background(remove_quotes, extra_ids,
+                              on_done=lambda ids: patch_quotes(tree, [(quote_id, None) for quote_id in ids]),
+                              description=f"Deleting {len(extra_ids)} duplicates...")
+
+        def save():
+            path = filedialog.asksaveasfilename(title="QuoteKeeper - Save Duplicate Report",
+                                                defaultextension=".json", filetypes=[("JSON", "*.json")],
+                                                parent=window)
+            if path:
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(groups, file, indent=2)
+
+        button_frame = Frame(window, bg=BACKGROUND_COLOR, padx=15, pady=10)
+        button_frame.pack(fill=X)
+        if extra_ids:
+            create_rounded_button(button_frame, f"Delete {len(extra_ids)} Exact Copies", RED_COLOR,
+                                  BACKGROUND_COLOR, delete_extra).pack(side=LEFT)
+        create_rounded_button(button_frame, "Save...", GREEN_COLOR, BACKGROUND_COLOR, save).pack(side=LEFT, padx=10)
+        create_rounded_button(button_frame, "Close", COMMENT_COLOR, FOREGROUND_COLOR, window.destroy).pack(side=RIGHT)
+
+    run_in_background(build_duplicate_report, on_done=built, key="duplicates", description="Finding duplicates...")
+
+
+# ------------------------------------------------------------------------------
+# Benchmarks
+# ------------------------------------------------------------------------------
+BENCH_FORMAT_VERSION = 1
+BENCH_SYLLABLES = ("ba", "ce", "di", "fo", "gu", "ha", "ji", "ko", "lu", "ma",
+                   "ne", "pi", "ro", "sa", "te", "vi", "wo", "xa", "yu", "ze")
+
+
+def _zipf_cum_weights(count, exponent=1.1):
+    """Cumulative weights giving rank r a share proportional to 1 / r**exponent."""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def seed_benchmark_quotes(count, seed=BENCH_SEED, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Insert `count` synthetic quotes. Authors, categories and words are drawn with a
+    Zipf-like skew, so a few authors and categories own most quotes and a long tail
+    owns one or two each. Returns the vocabularies, most frequent first.
+    """
+    rng = random.Random(seed)
+    syllables = ["".join(parts) for parts in itertools.product(BENCH_SYLLABLES, repeat=3)]
+    words = rng.sample(syllables, min(BENCH_VOCABULARY, len(syllables)))
+    authors = [f"{rng.choice(words).title()} {rng.choice(words).title()} {n}" for n in range(max(10, count // 50))]
+    categories = [f"{rng.choice(words).title()} {n}" for n in range(BENCH_CATEGORIES)]
+    word_weights = _zipf_cum_weights(len(words))
+    author_weights = _zipf_cum_weights(len(authors))
+    category_weights = _zipf_cum_weights(len(categories))
     conn = get_connection()
     cursor = conn.cursor()
-    search_term = f"%{query}%"
-    query_str = (
-        "SELECT * FROM quotes "
-        "WHERE quote_text LIKE %s "
-        "OR author LIKE %s "
-        "OR category LIKE %s"
-    )
-    cursor.execute(query_str, (search_term, search_term, search_term))
-    quotes = cursor.fetchall()
+    try:
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            batch = [(" ".join(rng.choices(words, cum_weights=word_weights, k=rng.randint(6, 24))).capitalize(),
+                      author, category)
+                     for author, category in zip(rng.choices(authors, cum_weights=author_weights, k=size),
+                                                 rng.choices(categories, cum_weights=category_weights, k=size))]
+            cursor.executemany("INSERT INTO quotes (quote_text, author, category) VALUES (%s, %s, %s)", batch)
+            conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+        quotes_changed()
+        reset_search_index()
+        reset_duplicate_index()
+        reset_quote_model()
+    return {"words": words, "authors": authors, "categories": categories}
+
+
+def use_database(name):
+    """Point the app at another MySQL database or SQLite file and drop everything cached."""
+    global DB_NAME, SQLITE_PATH, _fulltext_available
+    close_pool()
+    if get_backend().name == "sqlite":
+        SQLITE_PATH = name
+    else:
+        DB_NAME = name
+    _fulltext_available = None
+    reset_search_index()
+    reset_duplicate_index()
+    reset_quote_model()
+    invalidate_facet_cache()
+    _quote_cache.invalidate()
+    quotes_changed()
+
+
+def drop_database(name):
+    """Delete a MySQL database or SQLite file (and its WAL files) if it exists."""
+    if get_backend().name == "sqlite":
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(name + suffix):
+                os.remove(name + suffix)
+        return
+    conn = get_backend().connect_server()
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {name}")
     cursor.close()
     conn.close()
-    for quote in quotes:
-        tree.insert("", "end", values=quote)
-    if app_status_label:
-        app_status_label.config(text=f"Found {len(quotes)} results for '{query}'")
-    update_quote_count()
+
+
+def _measure(func, repeat, setup=None, teardown=None):
+    """
+    Time func(*setup()) `repeat` times with cold facet and quote caches.
+    Returns summary statistics in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        invalidate_facet_cache()
+        _quote_cache.invalidate()
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+        if teardown:
+            teardown()
+    return {"runs": repeat, "min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3),
+            "mean_ms": round(statistics.mean(samples), 3), "max_ms": round(max(samples), 3)}
+
+
+def _benchmark_targets(vocab):
+    """Search terms, authors and categories at the head and in the tail of the skew."""
+    return {"search": {"common": vocab["words"][0], "rare": vocab["words"][-1],
+                       "prefix": vocab["words"][1][:4], "phrase": " ".join(vocab["words"][2:4])},
+            "author": {"head": vocab["authors"][0], "tail": vocab["authors"][-1]},
+            "category": {"head": vocab["categories"][0], "tail": vocab["categories"][-1]}}
+
+
+def _benchmark_db(total, targets, repeat):
+    """The data layer alone: the queries behind each screen, without any Tk work."""
+    results = {}
+    first_page = lambda query: (query.count(), fetch_page(query, 0, PAGE_SIZE, after_id=0))
+    results["load_quotes"] = _measure(lambda: first_page(QuoteQuery()), repeat)
+    middle = QuoteQuery().fetch(total // 2, 1)[0][0]
+    results["page_offset_middle"] = _measure(lambda: QuoteQuery().fetch(total // 2, PAGE_SIZE), repeat)
+    results["page_keyset_middle"] = _measure(lambda: QuoteQuery().fetch_after(middle, PAGE_SIZE), repeat)
+    for name, keys in BENCH_SORTS.items():
+        results[f"sort_{name}"] = _measure(lambda: first_page(sort_query(QuoteQuery(), keys)), repeat)
+    for name, term in targets["search"].items():
+        results[f"search_quotes_{name}"] = _measure(lambda: find_quotes(term, 0, PAGE_SIZE), repeat)
+    for name, author in targets["author"].items():
+        results[f"filter_quotes_by_author_{name}"] = _measure(lambda: first_page(author_query(author)), repeat)
+    for name, category in targets["category"].items():
+        results[f"filter_quotes_by_category_{name}"] = _measure(lambda: first_page(category_query(category)),
+                                                                 repeat)
+    results["list_authors"] = _measure(lambda: get_facet_counts("author"), repeat)
+    results["list_categories"] = _measure(lambda: get_facet_counts("category"), repeat)
+    results["name_index_build"] = _measure(lambda: NameIndex(get_facet_counts("author")), repeat)
+    names = get_name_index("author")
+    results["autocomplete_author"] = _measure(lambda: names.complete(targets["author"]["tail"][:2]), repeat)
+    author, category = targets["author"]["head"], targets["category"]["head"]
+    new_row = lambda: (insert_quote("Benchmark quote", author, category)[0],)
+    results["add_quote"] = _measure(lambda: insert_quote("Benchmark quote", author, category), repeat)
+    results["update_quote"] = _measure(lambda quote_id: update_quote_row(quote_id, "Edited", author, category),
+                                       repeat, setup=new_row)
+    results["delete_quote"] = _measure(remove_quote, repeat, setup=new_row)
+    results["statement_reuse"] = _benchmark_statement_reuse(targets, repeat)
+    results["client_model"] = _benchmark_client_model(targets, repeat)
+    return results
+
+
+def _traced_bytes(build):
+    """Memory held by what build() returns, as traced by tracemalloc."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def _benchmark_client_model(targets, repeat):
+    """Memory per quote of the quote model against fetched row tuples, in-memory filtering and the snapshot."""
+    tuple_bytes, rows = _traced_bytes(QuoteQuery().fetch)
+    model_bytes, model = _traced_bytes(lambda: QuoteModel().build())
+    count = max(1, len(rows))
+    del rows
+    results = {"tuples_bytes_per_quote": round(tuple_bytes / count),
+               "model_bytes_per_quote": round(model_bytes / count)}
+    first_page = lambda query: (query.count(), query.fetch(0, PAGE_SIZE))
+    for column in ("author", "category"):
+        for name, value in targets[column].items():
+            # A fresh query per run, so the positions are found again each time.
+            results[f"filter_by_{column}_{name}"] = _measure(lambda: first_page(ModelQuery(model, column, value)),
+                                                             repeat)
+    for name, keys in BENCH_SORTS.items():
+        results[f"sort_{name}"] = _measure(lambda: first_page(sort_query(ModelQuery(model), keys)), repeat)
+    # Cold start: loading the model from the database against opening its snapshot.
+    path = os.path.join(tempfile.gettempdir(), "quotes_keeper_bench.snapshot")
+    results["model_build"] = _measure(lambda: QuoteModel().build(), repeat)
+    results["snapshot_write"] = _measure(lambda: write_snapshot(model, path), repeat)
+    results["snapshot_open"] = _measure(lambda: QuoteSnapshot(path).close(), repeat)
+    os.remove(path)
+    return results
+
+
+def _benchmark_statement_reuse(targets, repeat, calls=BENCH_STATEMENT_CALLS):
+    """
+    The repeated small statements behind the popups, counts and quote lookups, `calls`
+    times in a row, with and without the per-connection prepared statements.
+    """
+    global PREPARED_STATEMENTS
+    category = targets["category"]["tail"]
+    cases = {"list_categories": lambda: get_facet_counts("category"),
+             "list_authors": lambda: get_facet_counts("author"),
+             "count_by_category": lambda: category_query(category).count(),
+             "get_quote_by_id": lambda: load_quote(1)}
+    enabled = PREPARED_STATEMENTS
+    results = {}
+    try:
+        for prepared in (True, False):
+            PREPARED_STATEMENTS = prepared
+            for name, call in cases.items():
+                call()  # Warm up: prepare the statement / fill the page cache before timing
+
+                def run_calls(call=call):
+                    for _ in range(calls):
+                        invalidate_facet_cache()
+                        call()
+                results.setdefault(name, {})["prepared" if prepared else "unprepared"] = _measure(run_calls, repeat)
+    finally:
+        PREPARED_STATEMENTS = enabled
+    return {"calls_per_run": calls, "cases": results}
+
+
+def _benchmark_ui(targets, repeat):
+    """
+    The same operations driven through the main window, including Treeview population.
+    Data calls run inline so each timing covers the query and the widget updates.
+    """
+    global app_root, app_tree, app_status_label, app_quote_count_label, app_worker
+    try:
+        root, tree, status_label, quote_count_label = create_main_window()
+    except tk.TclError as err:
+        return {"skipped": f"no display available ({err}); run under xvfb-run"}
+    app_worker.shutdown()
+    app_worker = None
+    app_root, app_tree, app_status_label, app_quote_count_label = root, tree, status_label, quote_count_label
+    live_search = get_live_search(tree)
+
+    def run(action):
+        action()
+        root.update()
+
+    def search(term):
+        live_search.last_text = None  # Time a fresh search, not an in-memory refinement
+        run(lambda: search_quotes(tree, term))
+
+    def close_popups():
+        for widget in root.winfo_children():
+            if isinstance(widget, Toplevel):
+                widget.destroy()
+
+    def open_login_window():
+        login_window = create_login_window()[0]
+        login_window.update_idletasks()
+        login_window.destroy()
+
+    results = {}
+    try:
+        root.update()
+        results["login_window"] = _measure(open_login_window, repeat)
+        results["load_quotes"] = _measure(lambda: run(lambda: load_quotes(tree)), repeat)
+        for name, term in targets["search"].items():
+            results[f"search_quotes_{name}"] = _measure(lambda: search(term), repeat)
+        for name, author in targets["author"].items():
+            results[f"filter_quotes_by_author_{name}"] = _measure(
+                lambda: run(lambda: filter_quotes_by_author(tree, author)), repeat)
+        for name, category in targets["category"].items():
+            results[f"filter_quotes_by_category_{name}"] = _measure(
+                lambda: run(lambda: filter_quotes_by_category(tree, category)), repeat)
+        results["list_authors"] = _measure(lambda: run(lambda: list_authors(tree)), repeat, teardown=close_popups)
+        results["list_categories"] = _measure(lambda: run(lambda: list_categories(tree)), repeat,
+                                              teardown=close_popups)
+        author, category = targets["author"]["head"], targets["category"]["head"]
+        run(lambda: filter_quotes_by_author(tree, author))
+        new_row = lambda: (insert_quote("Benchmark quote", author, category)[0],)
+        results["add_quote"] = _measure(lambda: run(lambda: add_quote("Benchmark quote", author, category, tree)),
+                                        repeat)
+        results["update_quote"] = _measure(
+            lambda quote_id: run(lambda: update_quote(quote_id, "Edited", author, category, tree)),
+            repeat, setup=new_row)
+        # delete_quote() ends with a blocking messagebox; time the work before it.
+        results["delete_quote"] = _measure(
+            lambda quote_id: run(lambda: (remove_quote(quote_id), patch_quote(tree, quote_id, None))),
+            repeat, setup=new_row)
+    finally:
+        root.destroy()
+        app_root = app_tree = app_status_label = app_quote_count_label = None
+    return results
+
+
+def run_benchmarks(sizes=BENCH_SIZES, repeat=BENCH_REPEAT, seed=BENCH_SEED, ui=True, keep=False, progress=None):
+    """
+    Seed a scratch database per size and time the data layer and, when a display is
+    available (e.g. under Xvfb), the main window. The configured database is never
+    touched. Returns a JSON-serialisable report.
+    """
+    global SNAPSHOT
+    backend = get_backend()
+    original = SQLITE_PATH if backend.name == "sqlite" else DB_NAME
+    saving = SNAPSHOT
+    SNAPSHOT = False  # Every run loads from its scratch database; none leaves a snapshot behind
+    report = {"format": BENCH_FORMAT_VERSION, "backend": backend.name,
+              "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": sys.version.split()[0],
+              "platform": sys.platform,
+              "settings": {"repeat": repeat, "seed": seed, "page_size": PAGE_SIZE, "virtual_list": VIRTUAL_LIST,
+                           "search_engine": SEARCH_ENGINE},
+              "runs": []}
+    try:
+        for size in sizes:
+            if backend.name == "sqlite":
+                name = os.path.join(tempfile.gettempdir(), f"quotes_keeper_bench_{size}.db")
+            else:
+                name = f"{original}_bench_{size}"
+            drop_database(name)
+            use_database(name)
+            try:
+                initialize_database()
+                started = time.perf_counter()
+                vocab = seed_benchmark_quotes(size, seed)
+                run = {"size": size, "seed_seconds": round(time.perf_counter() - started, 3)}
+                if progress:
+                    progress(f"seeded {size} quotes in {run['seed_seconds']}s")
+                targets = _benchmark_targets(vocab)
+                run["targets"] = targets
+                run["db"] = _benchmark_db(size, targets, repeat)
+                if ui:
+                    run["ui"] = _benchmark_ui(targets, repeat)
+                report["runs"].append(run)
+                if progress:
+                    progress(f"timed {size} quotes")
+            finally:
+                use_database(original)
+                if not keep:
+                    drop_database(name)
+    finally:
+        SNAPSHOT = saving
+    return report
+
+
+# ------------------------------------------------------------------------------
+# Startup
+# ------------------------------------------------------------------------------
+# The login window is shown before anything touches the database: the schema check
+# (connect, CREATE DATABASE, migrations) runs once on a background thread while the
+# user types, and logging in only waits for it if it is still running.
+
+_schema_check = None  # Future of the background initialize_database() call
+
+
+def start_schema_check():
+    """Run initialize_database() on a background thread; returns its Future."""
+    global _schema_check
+    future = _schema_check = Future()
+
+    def check():
+        try:
+            with timed("startup.schema_check"):
+                version = initialize_database()
+                prune_change_log()
+            future.set_result(version)
+        except BaseException as err:
+            future.set_exception(err)
+
+    # Not a daemon: closing the login window mid-migration waits for the migration to finish.
+    threading.Thread(target=check, name="quotekeeper-schema").start()
+    return future
+
+
+def when_schema_ready(window, action, offline=None):
+    """
+    Call action() on the Tk thread once the schema check has finished, polling instead
+    of blocking so the window stays responsive. A failed check is reported and started
+    again, so the next attempt retries (e.g. once the MySQL server is running); if
+    `offline` is given and a local snapshot exists, it offers offline() instead.
+    """
+    if _schema_check is None:
+        start_schema_check()
+    if not _schema_check.done():
+        if not getattr(window, "waiting_for_schema", False):  # Ignore repeated clicks while waiting
+            window.waiting_for_schema = True
+            window.config(cursor="watch")
+            window.after(WORKER_POLL_MS, lambda: _wait_for_schema(window, action, offline))
+        return
+    error = _schema_check.exception()
+    if error is not None:
+        start_schema_check()
+        if offline and SNAPSHOT and os.path.exists(snapshot_path()):
+            if messagebox.askyesno("Offline", f"Could not open the database: {error}\n\n"
+                                              "Browse the local copy read-only instead?", parent=window):
+                offline()
+            return
+        messagebox.showerror("Error", f"Could not open the database: {error}", parent=window)
+        return
+    action()
+
+
+def _wait_for_schema(window, action, offline):
+    if not _schema_check.done():
+        window.after(WORKER_POLL_MS, lambda: _wait_for_schema(window, action, offline))
+        return
+    window.waiting_for_schema = False
+    window.config(cursor="")
+    when_schema_ready(window, action, offline)
+
+
+def record_startup(name, started, target_ms=None):
+    """Record a startup milestone in the metrics and warn on stderr when it misses its target."""
+    seconds = time.perf_counter() - started
+    if INSTRUMENT:
+        _metrics.record(name, seconds)
+    if target_ms is not None and seconds * 1000 > target_ms:
+        print(f"QuoteKeeper: {name} took {seconds * 1000:.0f} ms (target {target_ms} ms)", file=sys.stderr)
 
 
 # ------------------------------------------------------------------------------
@@ -820,17 +5593,19 @@ def open_signup_window():
             conn.commit()
             messagebox.showinfo("Success", "Account created successfully!")
             signup_window.destroy()
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             messagebox.showerror("Error", f"Username already exists or error occurred: {err}")
         finally:
             cursor.close()
             conn.close()
 
-    signup_button = create_rounded_button(frame, "Sign Up", GREEN_COLOR, BACKGROUND_COLOR, signup_action, bold=True)
+    signup_button = create_rounded_button(frame, "Sign Up", GREEN_COLOR, BACKGROUND_COLOR,
+                                          lambda: when_schema_ready(signup_window, signup_action), bold=True)
     signup_button.pack(pady=(10, 0))
 
 
 def authenticate(username, password, auth_window):
+    started = time.perf_counter()
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM users WHERE username=%s AND password=%s", (username, password))
@@ -839,17 +5614,37 @@ def authenticate(username, password, auth_window):
     conn.close()
     if user:
         auth_window.destroy()
-        root, tree, status_label, quote_count_label = create_main_window()
-        create_table()  # Ensure tables exist
-        load_quotes(tree)  # Load quotes from the database
-        update_quote_count()
-        global app_root, app_tree, app_status_label, app_quote_count_label
-        app_root, app_tree, app_status_label, app_quote_count_label = root, tree, status_label, quote_count_label
-        root.mainloop()
+        open_main_window(started)
     else:
         messagebox.showerror("Error", "Invalid username or password")
 
 
+def browse_offline(auth_window):
+    """Open the main window on the local snapshot, read-only, while the database can't be reached."""
+    global app_offline
+    started = time.perf_counter()
+    app_offline = True
+    auth_window.destroy()
+    open_main_window(started)
+
+
+def open_main_window(started):
+    """Show the main window, then load the list; the local snapshot is saved again on exit."""
+    root, tree, status_label, quote_count_label = create_main_window()
+    global app_root, app_tree, app_status_label, app_quote_count_label
+    app_root, app_tree, app_status_label, app_quote_count_label = root, tree, status_label, quote_count_label
+    if app_offline:
+        root.title("QuoteKeeper (offline, read-only)")
+    root.update_idletasks()  # Paint the window before waiting on any data
+    record_startup("startup.main_window", started)
+    # Load the first page in the background; the schema was already checked before login.
+    start_change_poller(root, tree)
+    load_quotes(tree, lambda total: record_startup("startup.first_page", started, STARTUP_FIRST_PAGE_TARGET_MS))
+    root.mainloop()
+    app_worker.shutdown()
+    save_snapshot()
+
+
 def create_login_window():
     auth_window = tk.Tk()
     auth_window.title("QuoteKeeper - Login")
@@ -885,7 +5680,9 @@ def create_login_window():
                            insertbackground=FOREGROUND_COLOR, bd=0)
     password_entry.pack(fill=X, ipady=8, pady=(0, 25))
     login_button = create_rounded_button(entry_frame, "Login", ACCENT_COLOR, BACKGROUND_COLOR,
-                                          lambda: authenticate(username_entry.get(), password_entry.get(), auth_window), bold=True)
+                                          lambda: when_schema_ready(auth_window, lambda: authenticate(
+                                              username_entry.get(), password_entry.get(), auth_window),
+                                              offline=lambda: browse_offline(auth_window)), bold=True)
     login_button.pack(pady=(0, 15))
     bottom_frame = Frame(welcome_frame, bg=BACKGROUND_COLOR)
     bottom_frame.pack(side=BOTTOM, fill=X, pady=(10, 20))
@@ -898,7 +5695,75 @@ def create_login_window():
     return auth_window, username_entry, password_entry
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QuoteKeeper - keep and browse your favourite quotes.")
+    commands = parser.add_subparsers(dest="command")
+    import_parser = commands.add_parser("import", help="bulk import quotes from a CSV, JSON Lines or SQL dump file")
+    import_parser.add_argument("path", help="file to import, e.g. quotes_db")
+    import_parser.add_argument("--format", choices=sorted(IMPORT_READERS), help="file format (default: detect)")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per transaction")
+    import_parser.add_argument("--keep-duplicates", action="store_true", help="do not skip duplicate quotes")
+    import_parser.add_argument("--load-data", action="store_true", help="use LOAD DATA LOCAL INFILE")
+    export_parser = commands.add_parser("export", help="stream quotes to a CSV, JSON Lines or Parquet file")
+    export_parser.add_argument("path", help="file to write")
+    export_parser.add_argument("--format", choices=sorted(EXPORT_WRITERS), help="file format (default: from extension)")
+    export_parser.add_argument("--author", help="only quotes by this author")
+    export_parser.add_argument("--category", help="only quotes in this category")
+    export_parser.add_argument("--search", help="only quotes matching this search")
+    export_parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="rows per chunk")
+    duplicates_parser = commands.add_parser("duplicates", help="report exact and near-duplicate quotes as JSON")
+    duplicates_parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD,
+                                   help="similarity reported as a near-duplicate (0-1)")
+    duplicates_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    bench_parser = commands.add_parser("bench", help="seed scratch databases and time the data layer and UI "
+                                                     "(use xvfb-run for the UI timings on a headless machine)")
+    bench_parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES, help="quotes to seed per run")
+    bench_parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="timed runs per operation")
+    bench_parser.add_argument("--seed", type=int, default=BENCH_SEED, help="random seed for the synthetic data")
+    bench_parser.add_argument("--no-ui", action="store_true", help="only time the data layer")
+    bench_parser.add_argument("--keep", action="store_true", help="keep the scratch databases afterwards")
+    bench_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        report = run_benchmarks(args.sizes, args.repeat, args.seed, not args.no_ui, args.keep,
+                                progress=lambda message: print(message, file=sys.stderr))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+        return
     initialize_database()
+    if args.command == "import":
+        def report(stats):
+            print(f"{stats['read']} rows read, {stats['inserted']} inserted, "
+                  f"{stats['rows_per_second']:.0f} rows/s", file=sys.stderr)
+
+        stats = import_quotes(args.path, args.format, args.batch_size, not args.keep_duplicates,
+                              args.load_data, report)
+        print(format_import_stats(stats))
+        return
+    if args.command == "duplicates":
+        groups = find_duplicate_groups(args.threshold,
+                                       progress=lambda count: print(f"{count} quotes scanned", file=sys.stderr))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(groups, file, indent=2)
+        else:
+            print(json.dumps(groups, indent=2))
+        return
+    if args.command == "export":
+        query, filters = build_export_query(args.author, args.category, args.search)
+        stats = export_quotes(args.path, args.format, query, filters, args.chunk_size)
+        print(format_export_stats(stats, args.path))
+        return
     auth_window, username_entry, password_entry = create_login_window()
+    auth_window.update_idletasks()
+    record_startup("startup.login_window", STARTUP_STARTED, STARTUP_LOGIN_TARGET_MS)
+    start_schema_check()
     auth_window.mainloop()
+
+
+if __name__ == "__main__":
+    main()